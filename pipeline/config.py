@@ -1,8 +1,21 @@
 """Central configuration for the Who Pays Them pipeline."""
 
 import os
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+from dotenv import load_dotenv
+
+__all__ = [
+    "PROJECT_ROOT", "PIPELINE_DIR", "DATA_DIR", "CACHE_DIR",
+    "FEC_BASE_URL", "ELECTION_YEAR",
+    "Settings", "get_settings",
+    "STATES", "SENATE_STATES_2026", "PARTY_MAP",
+    "STATE_NAMES", "STATE_DISCLOSURE_URLS",
+]
+
 # Paths
 PROJECT_ROOT = Path(__file__).parent.parent
 PIPELINE_DIR = PROJECT_ROOT / "pipeline"
@@ -13,22 +26,31 @@ CACHE_DIR = PROJECT_ROOT / ".cache"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-# Load .env from project root
-_env_file = PROJECT_ROOT / ".env"
-if _env_file.exists():
-    for _line in _env_file.read_text().splitlines():
-        _line = _line.strip()
-        if _line and not _line.startswith("#") and "=" in _line:
-            _k, _v = _line.split("=", 1)
-            os.environ.setdefault(_k.strip(), _v.strip().strip('"').strip("'"))
-
 # FEC API
-FEC_API_KEY = os.environ.get("FEC_API_KEY", "DEMO_KEY")
 FEC_BASE_URL = "https://api.open.fec.gov/v1"
 ELECTION_YEAR = 2026
 
-# FollowTheMoney API (state-level campaign finance)
-FTM_API_KEY = os.environ.get("FTM_API_KEY", "")
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Environment-derived configuration (API keys)."""
+    fec_api_key: str
+    ftm_api_key: str
+
+
+@lru_cache(maxsize=1)
+def get_settings():
+    """
+    Load .env and return the Settings singleton.
+    Deferred to first use so scripts that never touch an API
+    don't pay the cost at import time.
+    """
+    load_dotenv(PROJECT_ROOT / ".env", override=False)
+
+    return Settings(
+        fec_api_key=os.environ.get("FEC_API_KEY", "DEMO_KEY"),
+        ftm_api_key=os.environ.get("FTM_API_KEY", ""),
+    )
 
 # State abbreviations
 STATES = [
@@ -49,12 +71,13 @@ SENATE_STATES_2026 = [
     "VA", "WV", "WY"
 ]
 
-# Party code normalization
-PARTY_MAP = {
+# Party code normalization. Keys and values interned so every candidate
+# dict shares one string object per party code.
+PARTY_MAP = {sys.intern(k): sys.intern(v) for k, v in {
     "DEM": "D", "REP": "R", "LIB": "L", "GRE": "G",
     "IND": "I", "CON": "C", "DFL": "D", "NNE": "I",
     "D": "D", "R": "R", "L": "L", "G": "G", "I": "I",
-}
+}.items()}
 
 # State names for display
 STATE_NAMES = {
@@ -2,51 +2,85 @@
 Fetch all 2026 federal candidates from the FEC API.
 """
 
-import json
+import orjson
+import os
+import sys
 import time
 import requests
+import requests_cache
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import (
-    FEC_API_KEY, FEC_BASE_URL, ELECTION_YEAR,
+    FEC_BASE_URL, ELECTION_YEAR, get_settings,
     STATES, SENATE_STATES_2026, PARTY_MAP, STATE_NAMES,
     CACHE_DIR, DATA_DIR
 )
 
+# HTTP response cache TTL (6 hours). Set FEC_NO_HTTP_CACHE=1 to bypass.
+HTTP_CACHE_TTL = 21600
 
-def fec_get(endpoint, params=None, retries=3):
-    """Make an FEC API request with retry logic."""
+
+def _make_session():
+    """
+    Build a pooled session with retry/429 handling at the adapter layer.
+    Responses are cached on disk so development reruns skip the network.
+    """
+    if os.environ.get("FEC_NO_HTTP_CACHE"):
+        session = requests.Session()
+    else:
+        session = requests_cache.CachedSession(
+            str(CACHE_DIR / "fec_http_cache"),
+            expire_after=HTTP_CACHE_TTL,
+            allowable_methods=("GET",),
+            stale_if_error=True,
+        )
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"],
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared session: keep-alive reuses TCP/TLS connections across requests
+_session = _make_session()
+
+
+def fec_get(endpoint, params=None):
+    """Make an FEC API request. Retries and 429 backoff happen in the adapter."""
     if params is None:
         params = {}
-    params["api_key"] = FEC_API_KEY
+    params["api_key"] = get_settings().fec_api_key
     params["per_page"] = 100
 
     url = f"{FEC_BASE_URL}{endpoint}"
 
-    for attempt in range(retries):
-        try:
-            resp = requests.get(url, params=params, timeout=(10, 20))
-            if resp.status_code == 429:
-                wait = 2 ** (attempt + 1)
-                print(f"    Rate limited, waiting {wait}s...", flush=True)
-                time.sleep(wait)
-                continue
-            resp.raise_for_status()
-            return resp.json()
-        except requests.RequestException as e:
-            if attempt < retries - 1:
-                time.sleep(1)
-                continue
-            print(f"    API error: {e}", flush=True)
-            return None
-
-    return None
+    try:
+        resp = _session.get(url, params=params, timeout=(10, 20))
+        resp.raise_for_status()
+        return resp.json()
+    except requests.RequestException as e:
+        print(f"    API error: {e}", flush=True)
+        return None
 
 
+@lru_cache(maxsize=4096)
 def get_principal_committee(candidate_id):
     """
     Get the principal campaign committee ID for a candidate.
     The /candidates/ endpoint doesn't include committee data,
     so we call /candidate/{id}/committees/ separately.
+    Memoized: joint fundraising setups repeat committee IDs across candidates.
     """
     data = fec_get(f"/candidate/{candidate_id}/committees/", {
         "designation": "P",  # Principal campaign committee
@@ -56,10 +90,11 @@ def get_principal_committee(candidate_id):
     return data["results"][0].get("committee_id", "")
 
 
-def get_candidates_for_office(state, office, district=None):
+def iter_candidates_for_office(state, office, district=None):
     """
-    Get all candidates for a specific office.
+    Yield candidates for a specific office, page by page.
     office: 'H' (House), 'S' (Senate), 'P' (President)
+    Lazy: only one page of API results is held in memory at a time.
     """
     params = {
         "state": state,
@@ -72,63 +107,59 @@ def get_candidates_for_office(state, office, district=None):
     if district and office == "H":
         params["district"] = str(district).zfill(2)
 
-    results = []
     page = 1
 
+    # Intern the strings repeated across every candidate dict so downstream
+    # grouping and serialization compare by pointer
+    state = sys.intern(state)
+    is_house = office == "H"
+    office_label = sys.intern("U.S. House" if is_house else "U.S. Senate")
+
     while True:
         params["page"] = page
         data = fec_get("/candidates/", params)
         if not data or "results" not in data:
-            break
+            return
 
         for c in data["results"]:
             party_raw = c.get("party", "")
-            party = PARTY_MAP.get(party_raw, party_raw[:1] if party_raw else "?")
+            # Slice fallback only runs on a map miss
+            party = PARTY_MAP.get(party_raw) or (party_raw[:1] if party_raw else "?")
 
-            candidate = {
+            yield {
                 "name": c.get("name", "").title(),
                 "party": party,
                 "party_full": c.get("party_full", ""),
                 "state": state,
-                "district": str(c.get("district", "")).zfill(2) if office == "H" else None,
-                "office": "U.S. House" if office == "H" else "U.S. Senate",
+                "district": str(c.get("district", "")).zfill(2) if is_house else None,
+                "office": office_label,
                 "incumbent": c.get("incumbent_challenge") == "I",
                 "fec_id": c.get("candidate_id", ""),
                 "committee_id": "",
             }
 
-            results.append(candidate)
-
         pagination = data.get("pagination", {})
         if page >= pagination.get("pages", 1):
-            break
+            return
         page += 1
         time.sleep(0.2)  # Be nice to the API
 
-    return results
+
+def get_candidates_for_office(state, office, district=None):
+    """Get all candidates for a specific office as a list."""
+    return list(iter_candidates_for_office(state, office, district))
+
+
+# States (plus DC) with a single at-large House district
+AT_LARGE_STATES = frozenset({"AK", "DE", "MT", "ND", "SD", "VT", "WY", "DC"})
 
 
 def get_house_districts(state):
     """Get the number of House districts for a state."""
-    # At-large states have 1 district
-    at_large = ["AK", "DE", "MT", "ND", "SD", "VT", "WY", "DC"]
-    if state in at_large:
+    if state in AT_LARGE_STATES:
         return [0]  # 0 = at-large
 
     # For other states, we query FEC for what districts have candidates
-    params = {
-        "state": state,
-        "office": "H",
-        "election_year": ELECTION_YEAR,
-        "candidate_status": "C",
-        "per_page": 1,
-        "is_active_candidate": "true",
-    }
-    data = fec_get("/candidates/", params)
-    if not data:
-        return list(range(1, 2))  # Fallback
-
-    # Get distinct districts from all candidates
     all_params = {
         "state": state,
         "office": "H",
@@ -159,36 +190,36 @@ def fetch_all_candidates():
         age_hours = (_time.time() - cache_path.stat().st_mtime) / 3600
         if age_hours < 168:  # 7 days
             print("  Using cached candidate list")
-            with open(cache_path, encoding="utf-8") as f:
-                return json.load(f)
+            return orjson.loads(cache_path.read_bytes())
 
     print("Fetching 2026 federal candidates from FEC...")
     all_candidates = []
 
+    def fetch_state(state, office):
+        try:
+            return state, get_candidates_for_office(state, office)
+        except Exception as e:
+            print(f"    {state}: ERROR: {e}")
+            return state, []
+
     # Senate races (only states with Class II seats in 2026)
     print(f"\n  Senate races ({len(SENATE_STATES_2026)} states):")
-    for state in SENATE_STATES_2026:
-        print(f"    {state}...", end=" ", flush=True)
-        try:
-            candidates = get_candidates_for_office(state, "S")
-            print(f"{len(candidates)} candidates")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for state, candidates in pool.map(
+            lambda s: fetch_state(s, "S"), SENATE_STATES_2026
+        ):
+            print(f"    {state}: {len(candidates)} candidates")
             all_candidates.extend(candidates)
-        except Exception as e:
-            print(f"ERROR: {e}")
-        time.sleep(0.3)
 
     # House races (all 50 states + DC + territories)
     print(f"\n  House races:")
     house_states = [s for s in STATES if s not in ("PR", "GU", "VI", "AS", "MP")]
-    for state in house_states:
-        print(f"    {state}...", end=" ", flush=True)
-        try:
-            candidates = get_candidates_for_office(state, "H")
-            print(f"{len(candidates)} candidates")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for state, candidates in pool.map(
+            lambda s: fetch_state(s, "H"), house_states
+        ):
+            print(f"    {state}: {len(candidates)} candidates")
             all_candidates.extend(candidates)
-        except Exception as e:
-            print(f"ERROR: {e}")
-        time.sleep(0.3)
 
     # Deduplicate by FEC ID
     seen = set()
@@ -203,8 +234,7 @@ def fetch_all_candidates():
 
     # Cache for donor fetcher
     cache_path = CACHE_DIR / "candidates_raw.json"
-    with open(cache_path, "w", encoding="utf-8") as f:
-        json.dump(unique, f, indent=2)
+    cache_path.write_bytes(orjson.dumps(unique, option=orjson.OPT_INDENT_2))
 
     return unique
 
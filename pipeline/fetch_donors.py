@@ -3,48 +3,162 @@ Fetch top donors for each candidate from the FEC API.
 Uses committee_id for Schedule A queries (candidate_id returns super PAC data).
 """
 
+import heapq
 import json
+import orjson
+import os
+import re
+import threading
 import time
 import requests
+import requests_cache
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import (
-    FEC_API_KEY, FEC_BASE_URL, ELECTION_YEAR,
+    FEC_BASE_URL, ELECTION_YEAR, get_settings,
     CACHE_DIR, DATA_DIR
 )
 
+# HTTP response cache TTL (6 hours). Set FEC_NO_HTTP_CACHE=1 to bypass.
+HTTP_CACHE_TTL = 21600
 
-def fec_get(endpoint, params=None, retries=3):
-    """Make an FEC API request with retry logic."""
+
+def _make_session():
+    """
+    Build a pooled session with retry/429 handling at the adapter layer.
+    Responses are cached on disk so development reruns skip the network.
+    """
+    if os.environ.get("FEC_NO_HTTP_CACHE"):
+        session = requests.Session()
+    else:
+        session = requests_cache.CachedSession(
+            str(CACHE_DIR / "fec_http_cache"),
+            expire_after=HTTP_CACHE_TTL,
+            allowable_methods=("GET",),
+            stale_if_error=True,
+        )
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=1,
+            # 429 is handled in fec_get so the adaptive limiter sees it;
+            # the adapter only retries transient server errors
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=["GET"],
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared session: keep-alive reuses TCP/TLS connections across requests
+_session = _make_session()
+
+
+class RateLimiter:
+    """
+    Adaptive token-bucket rate limiter shared across worker threads.
+    Starts conservatively under the FEC key limit (1000 requests/hour) and
+    probes upward AIMD-style, like TCP congestion control: every 20 clean
+    responses step the rate up by 1 req/min toward the ceiling; any 429
+    halves it. Throughput converges on the API's real headroom instead of
+    sitting at the conservative floor.
+    """
+
+    def __init__(self, per_minute=14, burst=5, max_per_minute=60):
+        self.rate = float(per_minute)  # Current requests/minute
+        self.floor = 2.0
+        self.ceiling = float(max_per_minute)
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.count = 0  # Total requests acquired
+        self.streak = 0  # Consecutive successes since the last 429
+
+    def acquire(self):
+        """Block until a request token is available."""
+        while True:
+            with self.lock:
+                interval = 60.0 / self.rate
+                now = time.monotonic()
+                self.tokens = min(
+                    self.burst, self.tokens + (now - self.updated) / interval
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.count += 1
+                    return
+                wait = (1 - self.tokens) * interval
+            time.sleep(wait)
+
+    def on_success(self):
+        """Additive increase: a clean response extends the success streak."""
+        with self.lock:
+            self.streak += 1
+            if self.streak % 20 == 0:
+                self.rate = min(self.ceiling, self.rate + 1)
+
+    def on_throttle(self):
+        """Multiplicative decrease: the API said slow down, so halve the rate."""
+        with self.lock:
+            self.rate = max(self.floor, self.rate / 2)
+            self.streak = 0
+
+
+# The limiter currently driving enrichment. fec_get reports successes and
+# 429s here, so pacing adapts without threading the limiter through every
+# memoized helper (whose lru_cache keys must stay id-only).
+_active_limiter = None
+
+
+def fec_get(endpoint, params=None, session=None):
+    """
+    Make an FEC API request. Server-error retries happen in the adapter;
+    429s are handled here so the adaptive limiter can react to them.
+    """
+    if session is None:
+        session = _session
     if params is None:
         params = {}
-    params["api_key"] = FEC_API_KEY
+    params["api_key"] = get_settings().fec_api_key
     params["per_page"] = 100
 
     url = f"{FEC_BASE_URL}{endpoint}"
-
-    for attempt in range(retries):
-        try:
-            resp = requests.get(url, params=params, timeout=(10, 20))
-            if resp.status_code == 429:
-                wait = 2 ** (attempt + 1)
-                print(f"    Rate limited, waiting {wait}s...", end=" ", flush=True)
-                time.sleep(wait)
-                continue
-            resp.raise_for_status()
-            return resp.json()
-        except requests.RequestException as e:
-            if attempt < retries - 1:
-                time.sleep(1)
-                continue
-            print(f"    API error: {e}", flush=True)
-            return None
-
-    return None
+    limiter = _active_limiter
+
+    try:
+        resp = session.get(url, params=params, timeout=(10, 20))
+        if resp.status_code == 429:
+            if limiter is not None:
+                limiter.on_throttle()
+            try:
+                retry_after = float(resp.headers.get("Retry-After") or 15)
+            except ValueError:
+                # Retry-After can also be an HTTP-date; fall back to the default
+                retry_after = 15.0
+            time.sleep(retry_after)
+            resp = session.get(url, params=params, timeout=(10, 20))
+        resp.raise_for_status()
+        if limiter is not None:
+            limiter.on_success()
+        return resp.json()
+    except requests.RequestException as e:
+        print(f"    API error: {e}", flush=True)
+        return None
 
 
+@lru_cache(maxsize=4096)
 def get_candidate_totals(candidate_id):
-    """Get financial summary directly from candidate ID."""
+    """Get financial summary directly from candidate ID. Memoized per run."""
     data = fec_get(f"/candidate/{candidate_id}/totals/", {
         "cycle": ELECTION_YEAR,
     })
@@ -64,8 +178,9 @@ def get_candidate_totals(candidate_id):
     }
 
 
+@lru_cache(maxsize=4096)
 def get_principal_committee_id(candidate_id):
-    """Look up the principal campaign committee for a candidate."""
+    """Look up the principal campaign committee for a candidate. Memoized per run."""
     data = fec_get(f"/candidate/{candidate_id}/committees/")
     if not data or not data.get("results"):
         return None
@@ -79,11 +194,61 @@ def get_principal_committee_id(candidate_id):
     return None
 
 
-def get_individual_donors(committee_id):
+@lru_cache(maxsize=8192)
+def _title(s):
+    """str.title with a cache: the same employers and PACs recur across
+    candidates, so most display names are formatted exactly once."""
+    return s.title()
+
+
+# Employer values that don't identify an actual employer — checked per
+# Schedule A row, so a frozenset keeps the test a single hash lookup
+_JUNK_EMPLOYERS = frozenset({
+    "N/A", "NONE", "RETIRED", "SELF-EMPLOYED", "SELF",
+    "NOT EMPLOYED", "HOMEMAKER", "INFORMATION REQUESTED",
+})
+
+
+# Upper bound on Schedule A pages fetched per committee. Each page is one
+# API call, so this caps rate-limit pressure for the biggest campaigns.
+MAX_SCHEDULE_A_PAGES = 5
+
+
+def _iter_schedule_a(params, max_pages=MAX_SCHEDULE_A_PAGES):
+    """
+    Yield Schedule A result pages, following FEC keyset pagination.
+    The `last_indexes` cursor is the only supported way to page past
+    the first 100 rows when sorting by amount.
+    """
+    params = dict(params)
+    data = fec_get("/schedules/schedule_a/", params)
+    if data is None and "fields" in params:
+        # Some deployments reject the fields selector; retry with full schema
+        params.pop("fields")
+        data = fec_get("/schedules/schedule_a/", params)
+
+    pages = 0
+    while data and data.get("results"):
+        yield data["results"]
+        pages += 1
+        if pages >= max_pages:
+            return
+        last = (data.get("pagination") or {}).get("last_indexes") or {}
+        if not last.get("last_index"):
+            return
+        params.update(last)
+        data = fec_get("/schedules/schedule_a/", params)
+
+
+def get_individual_donors(committee_id, target_amount=None):
     """
     Get top itemized individual donors for a committee.
     MUST use committee_id (not candidate_id, which returns super PAC data).
     Returns aggregated by employer/organization.
+
+    Pages are amount-sorted, so once the running total covers 95% of
+    target_amount (the committee's itemized individual total) the tail
+    pages can't change the top donors and we stop fetching.
     """
     params = {
         "committee_id": committee_id,
@@ -91,91 +256,95 @@ def get_individual_donors(committee_id):
         "sort": "-contribution_receipt_amount",
         "is_individual": "true",
         "per_page": 100,
+        # Only the four fields the aggregation reads — shrinks the payload
+        "fields": "contribution_receipt_amount,contributor_employer,"
+                  "contributor_name,contributor_occupation",
     }
 
-    data = fec_get("/schedules/schedule_a/", params)
-    if not data or not data.get("results"):
-        return []
-
-    # Aggregate by employer/organization
-    by_employer = defaultdict(lambda: {"total": 0, "count": 0, "names": set()})
-    by_name = defaultdict(lambda: {"total": 0, "employer": "", "occupation": ""})
-
-    for item in data["results"]:
-        amount = item.get("contribution_receipt_amount", 0) or 0
-        employer = (item.get("contributor_employer") or "").strip().upper()
-        name = (item.get("contributor_name") or "").strip()
-        occupation = (item.get("contributor_occupation") or "").strip()
-
-        # Skip uninformative entries that don't identify who is paying
-        if _is_uninformative_donor(name) or _is_uninformative_donor(employer):
-            continue
-
-        if not employer or employer in ("N/A", "NONE", "RETIRED", "SELF-EMPLOYED", "SELF", "NOT EMPLOYED", "HOMEMAKER", "INFORMATION REQUESTED"):
-            if name:
-                by_name[name]["total"] += amount
-                by_name[name]["employer"] = employer or occupation or "Individual"
-                by_name[name]["occupation"] = occupation
-        else:
-            by_employer[employer]["total"] += amount
-            by_employer[employer]["count"] += 1
-            if name:
-                by_employer[employer]["names"].add(name)
+    # Aggregate by employer/organization. Parallel plain dicts instead of a
+    # defaultdict-of-dicts: one float and one int per unique key, no per-key
+    # nested containers to allocate.
+    employer_totals = {}
+    employer_counts = {}
+    name_totals = {}
+    name_occupations = {}
+    covered = 0.0
+
+    for results in _iter_schedule_a(params):
+        for item in results:
+            amount = item.get("contribution_receipt_amount", 0) or 0
+            employer = (item.get("contributor_employer") or "").strip().upper()
+            name = (item.get("contributor_name") or "").strip()
+            occupation = (item.get("contributor_occupation") or "").strip()
+            covered += amount
+
+            # Skip uninformative entries that don't identify who is paying
+            if _is_uninformative_donor(name) or _is_uninformative_donor(employer):
+                continue
+
+            if not employer or employer in _JUNK_EMPLOYERS:
+                if name:
+                    name_totals[name] = name_totals.get(name, 0) + amount
+                    name_occupations[name] = occupation
+            else:
+                employer_totals[employer] = employer_totals.get(employer, 0) + amount
+                employer_counts[employer] = employer_counts.get(employer, 0) + 1
+
+        if target_amount and covered >= 0.95 * target_amount:
+            break
 
     donors = []
-    for employer, data_dict in by_employer.items():
-        display_name = employer.title()
-        if data_dict["count"] > 1:
-            display_name += f" ({data_dict['count']} employees)"
+    for employer, total in employer_totals.items():
+        display_name = _title(employer)
+        count = employer_counts[employer]
+        if count > 1:
+            display_name += f" ({count} employees)"
         donors.append({
             "name": display_name,
-            "amount": round(data_dict["total"], 2),
+            "amount": round(total, 2),
             "type": "organization",
         })
 
-    for name, data_dict in by_name.items():
-        if data_dict["total"] >= 500:
+    for name, total in name_totals.items():
+        if total >= 500:
+            occupation = name_occupations[name]
             donors.append({
                 "name": name.title(),
-                "amount": round(data_dict["total"], 2),
+                "amount": round(total, 2),
                 "type": "individual",
-                "description": data_dict["occupation"].title() if data_dict["occupation"] else "",
+                "description": _title(occupation) if occupation else "",
             })
 
     return donors
 
 
-# Fundraising platforms to filter out (not real donors)
-_PAC_FILTER_NAMES = {"WINRED", "ACTBLUE", "ACTBLUE TECHNICAL SERVICES"}
-_JFC_KEYWORDS = ["VICTORY FUND", "VICTORY COMMITTEE", "JOINT FUNDRAISING"]
+# Fundraising platforms and joint fundraising committees to filter out (not
+# real donors). Compiled once: a single C-level regex scan replaces a Python
+# loop of substring checks per Schedule A row.
+_PLATFORM_JFC_RE = re.compile(
+    r"WINRED|ACTBLUE|VICTORY FUND|VICTORY COMMITTEE|JOINT FUNDRAISING", re.I
+)
 
 # Uninformative donor entries — these don't tell you WHO is paying
-_UNINFORMATIVE_KEYWORDS = ["UNITEMIZED", "AGGREGATED", "NOT ITEMIZED", "ANONYMOUS"]
+_UNINFORMATIVE_RE = re.compile(r"UNITEMIZED|AGGREGATED|NOT ITEMIZED|ANONYMOUS", re.I)
 
 
 def _is_uninformative_donor(name):
     """Check if a donor entry is uninformative (doesn't identify who is paying)."""
-    name_upper = name.upper()
-    return any(kw in name_upper for kw in _UNINFORMATIVE_KEYWORDS)
+    return _UNINFORMATIVE_RE.search(name) is not None
 
 
 def _is_platform_or_jfc(name):
     """Check if a contributor is a fundraising platform or joint fundraising committee."""
-    name_upper = name.upper()
-    for f in _PAC_FILTER_NAMES:
-        if f in name_upper:
-            return True
-    for kw in _JFC_KEYWORDS:
-        if kw in name_upper:
-            return True
-    return False
+    return _PLATFORM_JFC_RE.search(name) is not None
 
 
-def get_pac_donors(committee_id):
+def get_pac_donors(committee_id, target_amount=None):
     """
     Get PAC/committee contributions to a candidate's committee.
     Filters out WinRed, ActBlue, and joint fundraising transfers.
     MUST use committee_id (not candidate_id).
+    Paginates like get_individual_donors, with the same 95% coverage cutoff.
     """
     params = {
         "committee_id": committee_id,
@@ -185,38 +354,40 @@ def get_pac_donors(committee_id):
         "per_page": 100,
     }
 
-    data = fec_get("/schedules/schedule_a/", params)
-    if not data or not data.get("results"):
-        return []
-
     by_committee = defaultdict(lambda: {"total": 0, "count": 0})
+    covered = 0.0
 
-    for item in data["results"]:
-        amount = item.get("contribution_receipt_amount", 0) or 0
-        name = (item.get("contributor_name") or "").strip()
-        if not name:
-            name = (item.get("committee", {}) or {}).get("name", "Unknown PAC")
+    for results in _iter_schedule_a(params):
+        for item in results:
+            amount = item.get("contribution_receipt_amount", 0) or 0
+            name = (item.get("contributor_name") or "").strip()
+            if not name:
+                name = (item.get("committee", {}) or {}).get("name", "Unknown PAC")
+            covered += amount
 
-        if not name or amount <= 0:
-            continue
-        if _is_platform_or_jfc(name):
-            continue
-        if _is_uninformative_donor(name):
-            continue
+            if not name or amount <= 0:
+                continue
+            if _is_platform_or_jfc(name):
+                continue
+            if _is_uninformative_donor(name):
+                continue
 
-        by_committee[name]["total"] += amount
-        by_committee[name]["count"] += 1
+            by_committee[name]["total"] += amount
+            by_committee[name]["count"] += 1
+
+        if target_amount and covered >= 0.95 * target_amount:
+            break
 
     donors = []
     for name, data_dict in by_committee.items():
         donors.append({
-            "name": name.title(),
+            "name": _title(name),
             "amount": round(data_dict["total"], 2),
             "type": "pac",
         })
 
-    donors.sort(key=lambda x: x["amount"], reverse=True)
-    return donors[:10]
+    # Top 10 without sorting the full list: O(n log k) instead of O(n log n)
+    return heapq.nlargest(10, donors, key=lambda x: x["amount"])
 
 
 def compute_funding_breakdown(totals):
@@ -240,8 +411,9 @@ def compute_funding_breakdown(totals):
     }
 
 
+@lru_cache(maxsize=2048)
 def format_money(amount):
-    """Format dollar amount for display."""
+    """Format dollar amount for display. Cached: amounts repeat across runs."""
     if amount >= 1_000_000:
         return f"${amount / 1_000_000:.1f}M"
     elif amount >= 1_000:
@@ -250,7 +422,81 @@ def format_money(amount):
         return f"${amount:,.0f}"
 
 
-def enrich_candidates_with_donors(candidates, include_donors=False):
+def _empty_finance(candidate):
+    """Fill a candidate with empty finance fields."""
+    candidate["totals"] = None
+    candidate["donors"] = []
+    candidate["funding_breakdown"] = {"individual": 0, "pac": 0, "party": 0, "self": 0, "other": 0}
+    candidate["total_raised_display"] = "$0"
+
+
+def _fetch_candidate_finance(candidate, include_donors, limiter):
+    """
+    Fetch totals (and optionally top donors) for one candidate.
+    Runs on a worker thread; all API calls go through the shared limiter.
+    Returns a short status string for progress output.
+    """
+    fec_id = candidate["fec_id"]
+
+    # Step 1: Get financial totals (works with candidate_id)
+    limiter.acquire()
+    totals = get_candidate_totals(fec_id)
+    candidate["totals"] = totals
+
+    if totals and totals["total_raised"] > 0:
+        candidate["total_raised_display"] = format_money(totals["total_raised"])
+        candidate["funding_breakdown"] = compute_funding_breakdown(totals)
+        status = f"raised {candidate['total_raised_display']}"
+    else:
+        candidate["total_raised_display"] = "$0"
+        candidate["funding_breakdown"] = {"individual": 0, "pac": 0, "party": 0, "self": 0, "other": 0}
+        status = "$0"
+
+    # Step 2: Get donors (requires committee_id for correct data)
+    if include_donors and totals and totals["total_raised"] > 10000:
+        # Look up the principal campaign committee
+        limiter.acquire()
+        cmte_id = get_principal_committee_id(fec_id)
+
+        if cmte_id:
+            # Individual donors (by employer). The totals give each fetch a
+            # coverage target so pagination stops as early as possible.
+            limiter.acquire()
+            individual_donors = get_individual_donors(
+                cmte_id, target_amount=totals["individual_contributions"]
+            )
+
+            # PAC donors (only if candidate has PAC funding > 2%)
+            pac_donors = []
+            pac_pct = candidate.get("funding_breakdown", {}).get("pac", 0)
+            if pac_pct > 2:
+                limiter.acquire()
+                pac_donors = get_pac_donors(
+                    cmte_id, target_amount=totals["pac_contributions"]
+                )
+
+            # Combine and take top 10
+            all_donors = individual_donors + pac_donors
+            candidate["donors"] = heapq.nlargest(
+                10, all_donors, key=lambda x: x["amount"]
+            )
+
+            if all_donors:
+                status += f" ({len(individual_donors)} ind + {len(pac_donors)} PAC)"
+            else:
+                status += " (no itemized donors)"
+        else:
+            candidate["donors"] = []
+            status += " (no committee found)"
+    else:
+        candidate["donors"] = []
+        if include_donors:
+            status += " (skip donors)"
+
+    return status
+
+
+def enrich_candidates_with_donors(candidates, include_donors=False, max_workers=12):
     """Add financial data to each candidate. Uses committee_id for donor queries."""
     print(f"\nFetching financial data for {len(candidates)} candidates...")
     if include_donors:
@@ -258,6 +504,7 @@ def enrich_candidates_with_donors(candidates, include_donors=False):
 
     # Load per-candidate cache (survives across CI runs via actions/cache)
     donor_cache_path = CACHE_DIR / "donor_cache.json"
+    donor_journal_path = CACHE_DIR / "donor_cache.jsonl"
     donor_cache = {}
     if donor_cache_path.exists():
         try:
@@ -267,133 +514,98 @@ def enrich_candidates_with_donors(candidates, include_donors=False):
         except (json.JSONDecodeError, OSError):
             donor_cache = {}
 
+    # Replay journal entries from a previous run that died mid-fetch
+    if donor_journal_path.exists():
+        replayed = 0
+        with open(donor_journal_path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # Partial line from a crash mid-write
+                donor_cache[rec["fec_id"]] = rec["entry"]
+                replayed += 1
+        if replayed:
+            print(f"  Replayed {replayed} journal entries from interrupted run")
+
+    global _active_limiter
     cache_hits = 0
-    request_count = 0
     start_time = time.time()
-
-    def rate_limit_pause():
-        nonlocal request_count, start_time
-        request_count += 1
-        elapsed = time.time() - start_time
-        expected_time = request_count * (60.0 / 14)
-        if elapsed < expected_time:
-            pause = expected_time - elapsed
-            time.sleep(pause)
-
-    enriched = []
-    for i, candidate in enumerate(candidates):
+    limiter = RateLimiter()
+    _active_limiter = limiter
+    cache_lock = threading.Lock()
+
+    def save_cache():
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(donor_cache_path, "w", encoding="utf-8") as f:
+            json.dump(donor_cache, f)
+
+    # Resolve no-ID and cached candidates up front; queue the rest for workers
+    enriched = list(candidates)
+    to_fetch = []
+    for i, candidate in enumerate(enriched):
         fec_id = candidate.get("fec_id", "")
-        name = candidate["name"]
-
-        if i % 50 == 0:
-            elapsed = time.time() - start_time
-            rate = request_count / max(elapsed / 60, 0.1) if request_count else 0
-            print(f"\n  --- {i}/{len(candidates)} ({rate:.0f} req/min) ---", flush=True)
-        print(f"  [{i + 1}/{len(candidates)}] {name}...", end=" ", flush=True)
-
         if not fec_id:
-            print("no FEC ID")
-            candidate["totals"] = None
-            candidate["donors"] = []
-            candidate["funding_breakdown"] = {"individual": 0, "pac": 0, "party": 0, "self": 0, "other": 0}
-            candidate["total_raised_display"] = "$0"
-            enriched.append(candidate)
-            continue
-
-        # Check cache first
-        if fec_id in donor_cache:
+            _empty_finance(candidate)
+        elif fec_id in donor_cache:
             cached = donor_cache[fec_id]
             candidate["totals"] = cached.get("totals")
             candidate["donors"] = cached.get("donors", [])
             candidate["funding_breakdown"] = cached.get("funding_breakdown", {})
             candidate["total_raised_display"] = cached.get("total_raised_display", "$0")
-            enriched.append(candidate)
             cache_hits += 1
-            print("(cached)")
-            continue
+        else:
+            to_fetch.append(candidate)
 
-        try:
-            # Step 1: Get financial totals (works with candidate_id)
-            rate_limit_pause()
-            totals = get_candidate_totals(fec_id)
-            candidate["totals"] = totals
-
-            if totals and totals["total_raised"] > 0:
-                candidate["total_raised_display"] = format_money(totals["total_raised"])
-                candidate["funding_breakdown"] = compute_funding_breakdown(totals)
-                print(f"raised {candidate['total_raised_display']}", end=" ", flush=True)
-            else:
-                candidate["total_raised_display"] = "$0"
-                candidate["funding_breakdown"] = {"individual": 0, "pac": 0, "party": 0, "self": 0, "other": 0}
-
-            # Step 2: Get donors (requires committee_id for correct data)
-            if include_donors and totals and totals["total_raised"] > 10000:
-                # Look up the principal campaign committee
-                rate_limit_pause()
-                cmte_id = get_principal_committee_id(fec_id)
-
-                if cmte_id:
-                    # Individual donors (by employer)
-                    rate_limit_pause()
-                    individual_donors = get_individual_donors(cmte_id)
-
-                    # PAC donors (only if candidate has PAC funding > 2%)
-                    pac_donors = []
-                    pac_pct = candidate.get("funding_breakdown", {}).get("pac", 0)
-                    if pac_pct > 2:
-                        rate_limit_pause()
-                        pac_donors = get_pac_donors(cmte_id)
-
-                    # Combine, sort, take top 10
-                    all_donors = individual_donors + pac_donors
-                    all_donors.sort(key=lambda x: x["amount"], reverse=True)
-                    candidate["donors"] = all_donors[:10]
-
-                    n_ind = len(individual_donors)
-                    n_pac = len(pac_donors)
-                    if all_donors:
-                        print(f"({n_ind} ind + {n_pac} PAC)")
-                    else:
-                        print("(no itemized donors)")
-                else:
-                    candidate["donors"] = []
-                    print("(no committee found)")
-            else:
-                candidate["donors"] = []
-                if not include_donors:
-                    print("")
-                else:
-                    print("(skip donors)")
-
-        except Exception as e:
-            print(f"ERROR: {e}")
-            candidate["totals"] = None
-            candidate["donors"] = []
-            candidate["funding_breakdown"] = {"individual": 0, "pac": 0, "party": 0, "self": 0, "other": 0}
-            candidate["total_raised_display"] = "$0"
-
-        # Save to cache
-        donor_cache[fec_id] = {
-            "totals": candidate.get("totals"),
-            "donors": candidate.get("donors", []),
-            "funding_breakdown": candidate.get("funding_breakdown", {}),
-            "total_raised_display": candidate.get("total_raised_display", "$0"),
-        }
-        enriched.append(candidate)
-
-        # Periodic cache save (every 50 candidates)
-        if (i + 1) % 50 == 0:
-            CACHE_DIR.mkdir(parents=True, exist_ok=True)
-            with open(donor_cache_path, "w", encoding="utf-8") as f:
-                json.dump(donor_cache, f)
-
-    # Final cache save
+    print(f"  {cache_hits} cached, {len(to_fetch)} to fetch ({max_workers} workers)")
+
+    done = 0
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    with open(donor_cache_path, "w", encoding="utf-8") as f:
-        json.dump(donor_cache, f)
+    journal = open(donor_journal_path, "ab")
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(_fetch_candidate_finance, c, include_donors, limiter): c
+                for c in to_fetch
+            }
+            for future in as_completed(futures):
+                candidate = futures[future]
+                done += 1
+                try:
+                    status = future.result()
+                except Exception as e:
+                    status = f"ERROR: {e}"
+                    _empty_finance(candidate)
+
+                print(f"  [{done}/{len(to_fetch)}] {candidate['name']}: {status}", flush=True)
+
+                # Append one journal line per completed candidate so a
+                # killed run resumes from the last finished row
+                entry = {
+                    "totals": candidate.get("totals"),
+                    "donors": candidate.get("donors", []),
+                    "funding_breakdown": candidate.get("funding_breakdown", {}),
+                    "total_raised_display": candidate.get("total_raised_display", "$0"),
+                }
+                with cache_lock:
+                    donor_cache[candidate["fec_id"]] = entry
+                    journal.write(orjson.dumps(
+                        {"fec_id": candidate["fec_id"], "entry": entry}
+                    ) + b"\n")
+                    journal.flush()
+    finally:
+        journal.close()
+        _active_limiter = None
+
+    # Compact: fold the journal into the main cache file
+    save_cache()
+    donor_journal_path.unlink(missing_ok=True)
 
     elapsed = time.time() - start_time
-    print(f"\n  Done: {request_count} API calls, {cache_hits} cache hits, in {elapsed/60:.1f} minutes")
+    print(f"\n  Done: {limiter.count} API calls, {cache_hits} cache hits, in {elapsed/60:.1f} minutes")
     return enriched
 
 
@@ -409,6 +621,5 @@ if __name__ == "__main__":
 
     enriched = enrich_candidates_with_donors(candidates)
     output_path = CACHE_DIR / "candidates_enriched.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(enriched, f, indent=2)
+    output_path.write_bytes(orjson.dumps(enriched, option=orjson.OPT_INDENT_2))
     print(f"\nSaved {len(enriched)} enriched candidates to {output_path}")
@@ -6,17 +6,27 @@ The FTM API provides state-level campaign finance data aggregated from state dis
 Free API key required: sign up at https://www.followthemoney.org/
 """
 
-import json
+import orjson
+import re
+import threading
 import time
 import requests
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from requests.adapters import HTTPAdapter
 from config import CACHE_DIR
 
 # FollowTheMoney API
 FTM_BASE = "https://api.followthemoney.org"
 HEADERS = {"User-Agent": "WhoPaysThem/1.0 (civic data project)"}
 
+# Shared session: keep-alive reuses the TCP/TLS connection across the
+# hundreds of per-state and per-candidate calls below
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
 # States NOT covered by TransparencyUSA or state-specific scrapers
 # These are the 13 states that need FTM data
 FTM_STATES = [
@@ -27,8 +37,8 @@ FTM_STATES = [
 
 def _get_api_key():
     """Get FTM API key from environment."""
-    import os
-    key = os.environ.get("FTM_API_KEY", "")
+    from config import get_settings
+    key = get_settings().ftm_api_key
     if not key:
         print("  WARNING: FTM_API_KEY not set. Skipping FollowTheMoney integration.")
         print("  Sign up free at https://www.followthemoney.org/ to get a key.")
@@ -42,7 +52,7 @@ def _ftm_get(endpoint, params, api_key):
 
     url = f"{FTM_BASE}{endpoint}"
     try:
-        resp = requests.get(url, params=params, headers=HEADERS, timeout=30)
+        resp = _session.get(url, params=params, headers=HEADERS, timeout=30)
         if resp.status_code != 200:
             return None
         data = resp.json()
@@ -55,6 +65,29 @@ def _ftm_get(endpoint, params, api_key):
         return None
 
 
+def _deep_get(record, *path, default=None):
+    """Walk nested dicts along path, returning default on any miss.
+    FTM wraps most fields in single-key dicts, so parsers otherwise pile
+    up isinstance/.get probes per record."""
+    for key in path:
+        if not isinstance(record, dict):
+            return default
+        record = record.get(key)
+    return default if record is None else record
+
+
+def _total_dollars(record):
+    """Parse the Total_$ field, which FTM returns either as a scalar or as
+    a {'Total_$': value} wrapper."""
+    raw = record.get("Total_$")
+    if isinstance(raw, dict):
+        raw = raw.get("Total_$", 0)
+    try:
+        return float(raw or 0)
+    except (ValueError, TypeError):
+        return 0.0
+
+
 def fetch_ftm_governor_candidates(state, year, api_key):
     """
     Fetch governor candidate contribution totals from FollowTheMoney.
@@ -83,38 +116,29 @@ def fetch_ftm_governor_candidates(state, year, api_key):
         if not isinstance(record, dict):
             continue
 
-        # Extract name from nested Candidate or Career_Summary
-        name = ""
-        for key in ["Candidate", "Career_Summary"]:
-            val = record.get(key, {})
-            if isinstance(val, dict):
-                name = val.get(key, val.get("Candidate", ""))
-                break
-
-        # Extract entity ID (from Candidate_Entity or Career_Summary)
-        eid = ""
-        for eid_key in ["Candidate_Entity", "Career_Summary"]:
-            eid_val = record.get(eid_key, {})
-            if isinstance(eid_val, dict) and eid_val.get("id"):
-                eid = eid_val["id"]
-                break
-
-        # Extract total
-        total = 0
-        total_val = record.get("Total_$", {})
-        if isinstance(total_val, dict):
-            try:
-                total = float(total_val.get("Total_$", 0))
-            except (ValueError, TypeError):
-                pass
-        elif isinstance(total_val, (int, float)):
-            total = float(total_val)
-
-        # Extract party
-        party = ""
-        party_val = record.get("Specific_Party", record.get("General_Party", {}))
-        if isinstance(party_val, dict):
-            party = party_val.get("Specific_Party", party_val.get("General_Party", ""))
+        # Name from nested Candidate or Career_Summary
+        name = (
+            _deep_get(record, "Candidate", "Candidate")
+            or _deep_get(record, "Career_Summary", "Career_Summary")
+            or _deep_get(record, "Career_Summary", "Candidate")
+            or ""
+        )
+
+        # Entity ID (from Candidate_Entity or Career_Summary)
+        eid = (
+            _deep_get(record, "Candidate_Entity", "id")
+            or _deep_get(record, "Career_Summary", "id")
+            or ""
+        )
+
+        total = _total_dollars(record)
+
+        # Party
+        party = (
+            _deep_get(record, "Specific_Party", "Specific_Party")
+            or _deep_get(record, "General_Party", "General_Party")
+            or ""
+        )
         party_short = _normalize_party(party)
 
         if name and total > 0:
@@ -151,28 +175,13 @@ def fetch_ftm_candidate_donors(entity_id, api_key, year=2026):
         if not isinstance(record, dict):
             continue
 
-        # Extract donor name
-        name = ""
-        contrib_val = record.get("Contributor", {})
-        if isinstance(contrib_val, dict):
-            name = contrib_val.get("Contributor", "")
-
-        # Extract amount
-        amount = 0
-        total_val = record.get("Total_$", {})
-        if isinstance(total_val, dict):
-            try:
-                amount = float(total_val.get("Total_$", 0))
-            except (ValueError, TypeError):
-                pass
-
-        # Extract donor type
+        name = _deep_get(record, "Contributor", "Contributor") or ""
+        amount = _total_dollars(record)
+
         dtype = "individual"
-        type_val = record.get("Type_of_Contributor", {})
-        if isinstance(type_val, dict):
-            type_str = type_val.get("Type_of_Contributor", "")
-            if "Non-Individual" in type_str:
-                dtype = _classify_donor(name)
+        type_str = _deep_get(record, "Type_of_Contributor", "Type_of_Contributor") or ""
+        if "Non-Individual" in type_str:
+            dtype = _classify_donor(name)
 
         if name and amount > 0:
             if _is_uninformative_donor(name):
@@ -204,12 +213,13 @@ def _normalize_party(party_str):
     return "I"
 
 
-_UNINFORMATIVE_KEYWORDS = ["UNITEMIZED", "AGGREGATED", "NOT ITEMIZED", "ANONYMOUS"]
+# Compiled once so each donor row costs a single C-level scan
+_UNINFORMATIVE_RE = re.compile(r"UNITEMIZED|AGGREGATED|NOT ITEMIZED|ANONYMOUS", re.I)
 
 
 def _is_uninformative_donor(name):
     """Check if a donor entry is uninformative."""
-    return any(kw in name.upper() for kw in _UNINFORMATIVE_KEYWORDS)
+    return _UNINFORMATIVE_RE.search(name) is not None
 
 
 def _classify_donor(name):
@@ -233,8 +243,10 @@ def _format_dollar(amount):
     return f"${amount:,.0f}"
 
 
+@lru_cache(maxsize=8192)
 def _normalize_name(name):
-    """Normalize a name for matching."""
+    """Normalize a name for matching. Cached: the same names recur across
+    the merge and add-new passes."""
     name = name.lower().strip()
     for suffix in [" jr", " sr", " ii", " iii", " iv", " jr.", " sr."]:
         if name.endswith(suffix):
@@ -247,6 +259,19 @@ def _normalize_name(name):
     return name
 
 
+def _match_keys(name):
+    """
+    Index/lookup keys encoding the _names_match rule: the exact normalized
+    name, plus last name + first-3 prefix when the first name is long enough.
+    """
+    norm = _normalize_name(name)
+    keys = [norm]
+    parts = norm.split()
+    if len(parts) >= 2 and len(parts[0]) >= 3:
+        keys.append(f"{parts[-1]}|{parts[0][:3]}")
+    return keys
+
+
 def _names_match(name1, name2):
     """Check if two names refer to the same person."""
     n1 = _normalize_name(name1)
@@ -263,6 +288,49 @@ def _names_match(name1, name2):
     return False
 
 
+def _fetch_state_ftm(state, year, api_key, rate_limited):
+    """
+    Fetch one state's governor finance. Runs on a worker thread.
+    Returns (state, candidates, found_year); candidates is None if the
+    state was skipped because another thread hit the rate limit.
+    """
+    if rate_limited.is_set():
+        return state, None, year
+
+    # Try current year, then previous years down to last cycle
+    # 2026 data may not be filed yet; fall back to most recent available
+    candidates = []
+    found_year = year
+    for try_year in range(year, year - 5, -1):
+        candidates = fetch_ftm_governor_candidates(state, try_year, api_key)
+        if candidates == "RATE_LIMITED":
+            rate_limited.set()
+            return state, None, year
+        if candidates:
+            found_year = try_year
+            break
+        time.sleep(0.3)
+
+    if not candidates:
+        return state, [], found_year
+
+    # Fetch donors for candidates with significant money
+    for cand in candidates:
+        if (
+            not rate_limited.is_set()
+            and cand["total_contributions"] > 1000
+            and cand.get("entity_id")
+        ):
+            cand["donors"] = fetch_ftm_candidate_donors(
+                cand["entity_id"], api_key, year=found_year
+            )
+            time.sleep(0.3)
+        else:
+            cand["donors"] = []
+
+    return state, candidates, found_year
+
+
 def fetch_all_ftm_finance(states=None, year=2026):
     """
     Fetch governor finance data from FollowTheMoney for all specified states.
@@ -282,54 +350,36 @@ def fetch_all_ftm_finance(states=None, year=2026):
         age_hours = (time.time() - cache_path.stat().st_mtime) / 3600
         if age_hours < 24:
             print("  Using cached FTM finance data")
-            with open(cache_path, encoding="utf-8") as f:
-                return json.load(f)
+            return orjson.loads(cache_path.read_bytes())
 
     print(f"  Fetching governor finance from FollowTheMoney ({len(states)} states)...")
     all_finance = {}
 
-    for state in states:
-        print(f"    {state}...", end=" ", flush=True)
-
-        # Try current year, then previous years down to last cycle
-        # 2026 data may not be filed yet; fall back to most recent available
-        candidates = []
-        found_year = year
-        for try_year in range(year, year - 5, -1):
-            candidates = fetch_ftm_governor_candidates(state, try_year, api_key)
-            if candidates == "RATE_LIMITED":
-                print("API RATE LIMITED - stopping FTM fetch")
-                print("  Account is pending Institute review. Try again in 1-2 business days.")
-                return all_finance
-            if candidates:
-                found_year = try_year
-                break
-            time.sleep(0.3)
-
-        if not candidates:
-            print("no data")
-            time.sleep(0.3)
-            continue
+    # States are independent, so fetch them on worker threads. A shared
+    # event stops remaining work as soon as FTM reports a rate limit.
+    rate_limited = threading.Event()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for state, candidates, found_year in pool.map(
+            lambda s: _fetch_state_ftm(s, year, api_key, rate_limited), states
+        ):
+            if candidates is None:
+                continue  # Skipped after a rate limit
+            if not candidates:
+                print(f"    {state}: no data")
+                continue
+            all_finance[state] = candidates
+            funded = sum(1 for c in candidates if c["total_contributions"] > 0)
+            year_note = f" (from {found_year})" if found_year != year else ""
+            print(f"    {state}: {len(candidates)} candidates, {funded} with ${year_note}")
 
-        # Fetch donors for candidates with significant money
-        for cand in candidates:
-            if cand["total_contributions"] > 1000 and cand.get("entity_id"):
-                donors = fetch_ftm_candidate_donors(cand["entity_id"], api_key, year=found_year)
-                cand["donors"] = donors
-                time.sleep(0.3)
-            else:
-                cand["donors"] = []
-
-        all_finance[state] = candidates
-        funded = sum(1 for c in candidates if c["total_contributions"] > 0)
-        year_note = f" (from {found_year})" if found_year != year else ""
-        print(f"{len(candidates)} candidates, {funded} with ${year_note}")
-        time.sleep(0.3)
+    if rate_limited.is_set():
+        print("  API RATE LIMITED - stopping FTM fetch")
+        print("  Account is pending Institute review. Try again in 1-2 business days.")
+        return all_finance
 
     # Cache results
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    with open(cache_path, "w", encoding="utf-8") as f:
-        json.dump(all_finance, f, indent=2)
+    cache_path.write_bytes(orjson.dumps(all_finance, option=orjson.OPT_INDENT_2))
 
     total = sum(len(v) for v in all_finance.values())
     print(f"\n  FollowTheMoney: {total} candidates across {len(all_finance)} states")
@@ -351,20 +401,40 @@ def enrich_governors_with_ftm(candidates, ftm_finance=None):
     merged_count = 0
     party_fixed = 0
 
+    # Normalized names already present per state, built once up front and
+    # shared by the merge loop below and the add-new loop at the bottom
+    existing_by_state = defaultdict(set)
+    for c in candidates:
+        existing_by_state[c["state"]].add(_normalize_name(c["name"]))
+
+    # Index FTM candidates once per state so the merge loop does O(1)
+    # lookups instead of an O(M) _names_match scan per local candidate
+    ftm_index = {}
+    for state, ftm_cands in ftm_finance.items():
+        index = ftm_index[state] = {}
+        for fc in ftm_cands:
+            for key in _match_keys(fc["name"]):
+                index.setdefault(key, fc)
+
     for candidate in candidates:
         state = candidate["state"]
-        if state not in ftm_finance:
+        index = ftm_index.get(state)
+        if not index:
             continue
 
         # Only fill in if no existing finance data
         has_finance = (candidate.get("totals") or {}).get("total_raised", 0) > 0
-        ftm_candidates = ftm_finance[state]
 
-        # Try to match by name
+        # Nothing to merge and no party to fix — skip the lookup entirely
+        if has_finance and candidate.get("party") != "I":
+            continue
+
+        # Try to match by name: exact normalized name first, then the
+        # last-name + first-3-prefix fallback
         best_match = None
-        for fc in ftm_candidates:
-            if _names_match(candidate["name"], fc["name"]):
-                best_match = fc
+        for key in _match_keys(candidate["name"]):
+            best_match = index.get(key)
+            if best_match:
                 break
 
         if not best_match:
@@ -400,10 +470,6 @@ def enrich_governors_with_ftm(candidates, ftm_finance=None):
 
     # Also add candidates from FTM that aren't in Ballotpedia yet
     added_count = 0
-    existing_by_state = defaultdict(set)
-    for c in candidates:
-        existing_by_state[c["state"]].add(_normalize_name(c["name"]))
-
     for state, ftm_cands in ftm_finance.items():
         for fc in ftm_cands:
             if fc["total_contributions"] < 1000:
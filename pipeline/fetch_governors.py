@@ -3,13 +3,38 @@ Fetch 2026 governor candidates from Ballotpedia.
 Scrapes individual state pages since no free API provides this data.
 """
 
-import json
+import orjson
 import re
+import sys
 import time
 import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from lxml import etree
+from lxml import html as lxml_html
 from pathlib import Path
-from config import CACHE_DIR
+from requests.adapters import HTTPAdapter
+from config import CACHE_DIR, STATE_NAMES
+
+def _looks_blocked(html):
+    """True when a page is a Ballotpedia CAPTCHA/rate-limit interstitial."""
+    lower = html.lower()
+    return "captcha" in lower or "rate limit" in lower
+
+
+# Shared session: keep-alive amortizes the TLS handshake across the
+# 36+ Ballotpedia pages fetched per run, and the disk cache revalidates
+# with ETag/If-Modified-Since so unchanged pages cost a 304, not a body.
+# CAPTCHA interstitials arrive as 200s; filter_fn keeps them out of the
+# cache so a blocked run can't poison the next 24h of re-runs
+_session = requests_cache.CachedSession(
+    str(CACHE_DIR / "ballotpedia_http_cache"),
+    expire_after=86400,
+    cache_control=True,
+    allowable_methods=("GET",),
+    stale_if_error=True,
+    filter_fn=lambda response: not _looks_blocked(response.text),
+)
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
 # 36 states with governor races in 2026
 GOVERNOR_STATES_2026 = [
@@ -19,19 +44,6 @@ GOVERNOR_STATES_2026 = [
     "SD", "TN", "TX", "VT", "WI", "WY",
 ]
 
-STATE_NAMES = {
-    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
-    "CA": "California", "CO": "Colorado", "CT": "Connecticut", "FL": "Florida",
-    "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho", "IL": "Illinois",
-    "IA": "Iowa", "KS": "Kansas", "ME": "Maine", "MD": "Maryland",
-    "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota", "NE": "Nebraska",
-    "NV": "Nevada", "NH": "New Hampshire", "NM": "New Mexico", "NY": "New York",
-    "OH": "Ohio", "OK": "Oklahoma", "OR": "Oregon", "PA": "Pennsylvania",
-    "RI": "Rhode Island", "SC": "South Carolina", "SD": "South Dakota",
-    "TN": "Tennessee", "TX": "Texas", "VT": "Vermont", "WI": "Wisconsin",
-    "WY": "Wyoming",
-}
-
 PARTY_NORMALIZE = {
     "Democratic": "D",
     "Republican": "R",
@@ -57,6 +69,34 @@ PARTY_FULL = {
 }
 
 
+def _class_xpath(tag, cls, axis=".//"):
+    """XPath matching `tag` elements carrying `cls` as a whole class token."""
+    return (
+        f"{axis}{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+    )
+
+
+# Compiled XPath selectors: traversal runs in lxml's C layer instead of
+# BeautifulSoup's Python-level tree walk over each large Ballotpedia page.
+# The votebox selector includes the root so fragment inputs still match.
+_XP_VOTEBOX = etree.XPath(_class_xpath("div", "votebox", axis="descendant-or-self::"))
+_XP_RACE_HEADER = etree.XPath(_class_xpath("div", "race_header"))
+_XP_RESULTS_TEXT = etree.XPath(_class_xpath("p", "results_text"))
+_XP_RESULTS_ROW = etree.XPath(_class_xpath("tr", "results_row"))
+_XP_LINK = etree.XPath(".//a")
+_XP_THUMB = etree.XPath(".//div[contains(@class, 'image-candidate-thumbnail-wrapper')]")
+
+# Fallback party detection from row text: one compiled alternation scans
+# the row in a single C-level pass instead of eight chained `in` checks
+_ROW_PARTY_RE = re.compile(r"democratic|\(d\)|republican|\(r\)|libertarian|\(l\)|green|\(g\)")
+_ROW_PARTY_MAP = {
+    "democratic": "Democratic", "(d)": "Democratic",
+    "republican": "Republican", "(r)": "Republican",
+    "libertarian": "Libertarian", "(l)": "Libertarian",
+    "green": "Green", "(g)": "Green",
+}
+
+
 def _ballotpedia_urls(state_abbr):
     """Build possible Ballotpedia URLs for a state's 2026 governor race.
     Some states use 'gubernatorial_and_lieutenant_gubernatorial_election'."""
@@ -70,20 +110,24 @@ def _ballotpedia_urls(state_abbr):
 
 def _parse_candidates_from_page(html, state_abbr):
     """Parse governor candidates from a Ballotpedia state page."""
-    soup = BeautifulSoup(html, "lxml")
-    voteboxes = soup.find_all("div", class_="votebox")
+    tree = lxml_html.fromstring(html)
     candidates = []
     seen_names = set()
 
-    for vb in voteboxes:
+    # Intern the strings repeated across every candidate dict so downstream
+    # grouping and serialization compare by pointer
+    state_abbr = sys.intern(state_abbr)
+    office_label = sys.intern("Governor")
+
+    for vb in _XP_VOTEBOX(tree):
         # Get race header and results text
-        race_header = vb.find("div", class_="race_header")
-        results_p = vb.find("p", class_="results_text")
+        race_header = _XP_RACE_HEADER(vb)
+        results_p = _XP_RESULTS_TEXT(vb)
         if not race_header:
             continue
 
-        header = race_header.get_text(strip=True).lower()
-        results_text = results_p.get_text(strip=True).lower() if results_p else ""
+        header = race_header[0].text_content().strip().lower()
+        results_text = results_p[0].text_content().strip().lower() if results_p else ""
 
         # Only include current 2026 races: "running in" = current, "ran in" = historical
         is_current = "running in" in results_text or "is running" in results_text
@@ -95,12 +139,12 @@ def _parse_candidates_from_page(html, state_abbr):
         is_dem_primary = "democratic primary" in header
         is_rep_primary = "republican primary" in header
 
-        for row in vb.find_all("tr", class_="results_row"):
+        for row in _XP_RESULTS_ROW(vb):
             # Get name from link
-            name_link = row.find("a")
+            name_link = _XP_LINK(row)
             if not name_link:
                 continue
-            name = name_link.get_text(strip=True)
+            name = name_link[0].text_content().strip()
 
             # Skip placeholder entries
             if not name or name == "Submit photo" or len(name) < 3:
@@ -113,10 +157,10 @@ def _parse_candidates_from_page(html, state_abbr):
             seen_names.add(name_key)
 
             # Get party from thumbnail div class
-            thumb = row.find("div", class_=re.compile(r"image-candidate-thumbnail-wrapper"))
+            thumbs = _XP_THUMB(row)
             party = ""
-            if thumb:
-                for cls in thumb.get("class", []):
+            if thumbs:
+                for cls in (thumbs[0].get("class") or "").split():
                     if cls != "image-candidate-thumbnail-wrapper":
                         party = cls
                         break
@@ -130,19 +174,12 @@ def _parse_candidates_from_page(html, state_abbr):
 
             # Secondary detection: search row text for party keywords
             if not party or party not in PARTY_NORMALIZE:
-                row_text_lower = row.get_text().lower()
-                if "democratic" in row_text_lower or "(d)" in row_text_lower:
-                    party = "Democratic"
-                elif "republican" in row_text_lower or "(r)" in row_text_lower:
-                    party = "Republican"
-                elif "libertarian" in row_text_lower or "(l)" in row_text_lower:
-                    party = "Libertarian"
-                elif "green" in row_text_lower or "(g)" in row_text_lower:
-                    party = "Green"
+                m = _ROW_PARTY_RE.search(row.text_content().lower())
+                if m:
+                    party = _ROW_PARTY_MAP[m.group(0)]
 
             # Check for incumbent
-            row_text = row.get_text()
-            incumbent = "Incumbent" in row_text
+            incumbent = "Incumbent" in row.text_content()
 
             # Normalize party (default unknown to Independent)
             party_short = PARTY_NORMALIZE.get(party, party[:1] if party else "I")
@@ -151,10 +188,10 @@ def _parse_candidates_from_page(html, state_abbr):
 
             candidates.append({
                 "name": name,
-                "party": party_short,
-                "party_full": PARTY_FULL.get(party_short, party or "Unknown"),
+                "party": sys.intern(party_short),
+                "party_full": sys.intern(PARTY_FULL.get(party_short, party or "Unknown")),
                 "state": state_abbr,
-                "office": "Governor",
+                "office": office_label,
                 "incumbent": incumbent,
                 "fec_id": "",  # Governors don't have FEC IDs
                 "district": None,
@@ -172,8 +209,7 @@ def fetch_governor_candidates():
         age_hours = (time.time() - cache_path.stat().st_mtime) / 3600
         if age_hours < 24:
             print("  Using cached governor data")
-            with open(cache_path, encoding="utf-8") as f:
-                return json.load(f)
+            return orjson.loads(cache_path.read_bytes())
 
     print(f"  Scraping Ballotpedia for {len(GOVERNOR_STATES_2026)} governor races...")
     all_candidates = []
@@ -185,17 +221,18 @@ def fetch_governor_candidates():
         found = False
         for url in urls:
             try:
-                resp = requests.get(url, timeout=30, headers={
+                resp = _session.get(url, timeout=30, headers={
                     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
                 })
                 if resp.status_code == 404:
                     continue
                 resp.raise_for_status()
-                # Check for CAPTCHA/rate limiting
-                if "captcha" in resp.text.lower() or "rate limit" in resp.text.lower():
+                # Check for CAPTCHA/rate limiting; refresh=True makes the
+                # retry hit the network instead of any cached copy
+                if _looks_blocked(resp.text):
                     print("CAPTCHA detected, waiting 30s...", end=" ", flush=True)
                     time.sleep(30)
-                    resp = requests.get(url, timeout=30, headers={
+                    resp = _session.get(url, timeout=30, refresh=True, headers={
                         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
                     })
                 candidates = _parse_candidates_from_page(resp.text, state)
@@ -216,8 +253,7 @@ def fetch_governor_candidates():
 
     # Cache results
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    with open(cache_path, "w", encoding="utf-8") as f:
-        json.dump(all_candidates, f, indent=2)
+    cache_path.write_bytes(orjson.dumps(all_candidates, option=orjson.OPT_INDENT_2))
 
     return all_candidates
 
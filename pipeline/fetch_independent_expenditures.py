@@ -7,54 +7,130 @@ This captures spending by Super PACs, 501(c)(4)s, and other outside groups
 that spend independently to support or oppose candidates.
 """
 
-import json
+import heapq
+import orjson
+import os
+import re
+import threading
 import time
 import requests
+import requests_cache
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from config import FEC_API_KEY, FEC_BASE_URL, ELECTION_YEAR, CACHE_DIR
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import FEC_BASE_URL, ELECTION_YEAR, CACHE_DIR, get_settings
+from fetch_donors import RateLimiter
+
+# HTTP response cache TTL (6 hours). Set FEC_NO_HTTP_CACHE=1 to bypass.
+HTTP_CACHE_TTL = 21600
+
+
+def _make_session():
+    """
+    Build a pooled session with retry/429 handling at the adapter layer.
+    Responses are cached on disk so development reruns skip the network.
+    """
+    if os.environ.get("FEC_NO_HTTP_CACHE"):
+        session = requests.Session()
+    else:
+        session = requests_cache.CachedSession(
+            str(CACHE_DIR / "fec_http_cache"),
+            expire_after=HTTP_CACHE_TTL,
+            allowable_methods=("GET",),
+            stale_if_error=True,
+        )
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=1,
+            # 429 is handled in fec_get so the adaptive limiter sees it;
+            # the adapter only retries transient server errors
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=["GET"],
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Shared session: keep-alive reuses TCP/TLS connections across requests
+_session = _make_session()
 
 
 # Minimum raised to fetch outside spending (focus on competitive races)
 OUTSIDE_SPENDING_THRESHOLD = 100_000
 
-# Uninformative committee names to skip
+# Uninformative committee names to skip. Compiled into one alternation so
+# each Schedule E row costs a single C-level scan however many entries the
+# skip set grows to.
 _SKIP_COMMITTEES = {"ACTBLUE", "WINRED"}
+_SKIP_RE = re.compile("|".join(map(re.escape, sorted(_SKIP_COMMITTEES))))
 
+# How long a cached IE entry stays valid before it is refetched
+IE_CACHE_TTL_DAYS = 7
 
-def fec_get(endpoint, params=None, retries=3):
-    """Make an FEC API request with retry logic."""
+# Sentinel for API failures. A candidate with no IE activity legitimately
+# caches as None; a failed fetch must stay out of the cache entirely, or
+# one bad API day would poison those entries until someone deleted the file.
+FETCH_FAILED = object()
+
+
+# The limiter currently driving enrichment. fec_get reports successes and
+# 429s here, so pacing adapts without threading the limiter through the
+# memoized get_independent_expenditures.
+_active_limiter = None
+
+
+def fec_get(endpoint, params=None):
+    """
+    Make an FEC API request. Server-error retries happen in the adapter;
+    429s are handled here so the adaptive limiter can react to them and
+    the server's Retry-After is honored instead of a fixed 2^n backoff.
+    """
     if params is None:
         params = {}
-    params["api_key"] = FEC_API_KEY
+    params["api_key"] = get_settings().fec_api_key
     params["per_page"] = 100
 
     url = f"{FEC_BASE_URL}{endpoint}"
-
-    for attempt in range(retries):
-        try:
-            resp = requests.get(url, params=params, timeout=(10, 30))
-            if resp.status_code == 429:
-                wait = 2 ** (attempt + 1)
-                print(f"    Rate limited, waiting {wait}s...", end=" ", flush=True)
-                time.sleep(wait)
-                continue
-            resp.raise_for_status()
-            return resp.json()
-        except requests.RequestException as e:
-            if attempt < retries - 1:
-                time.sleep(1)
-                continue
-            print(f"    API error: {e}", flush=True)
-            return None
-
-    return None
+    limiter = _active_limiter
+
+    try:
+        resp = _session.get(url, params=params, timeout=(10, 30))
+        if resp.status_code == 429:
+            if limiter is not None:
+                limiter.on_throttle()
+            try:
+                retry_after = float(resp.headers.get("Retry-After") or 15)
+            except ValueError:
+                # Retry-After can also be an HTTP-date; fall back to the default
+                retry_after = 15.0
+            print(f"    Rate limited, waiting {retry_after:.0f}s...", end=" ", flush=True)
+            time.sleep(retry_after)
+            resp = _session.get(url, params=params, timeout=(10, 30))
+        resp.raise_for_status()
+        if limiter is not None:
+            limiter.on_success()
+        return resp.json()
+    except requests.RequestException as e:
+        print(f"    API error: {e}", flush=True)
+        return None
 
 
+@lru_cache(maxsize=50_000)
 def get_independent_expenditures(candidate_id):
     """
     Get independent expenditure data for a candidate.
-    Returns aggregated spending by committee, grouped by support/oppose.
+    Returns aggregated spending by committee, grouped by support/oppose,
+    None when the candidate has no IE activity, or FETCH_FAILED when the
+    API errored. Memoized per run: the same FEC ID can appear on several
+    candidate records.
     """
     params = {
         "candidate_id": candidate_id,
@@ -64,7 +140,9 @@ def get_independent_expenditures(candidate_id):
     }
 
     data = fec_get("/schedules/schedule_e/", params)
-    if not data or not data.get("results"):
+    if data is None:
+        return FETCH_FAILED
+    if not data.get("results"):
         return None
 
     # Aggregate by committee and support/oppose
@@ -76,7 +154,7 @@ def get_independent_expenditures(candidate_id):
             committee_name = item.get("committee_name", "Unknown")
 
         # Skip fundraising platforms
-        if any(skip in committee_name.upper() for skip in _SKIP_COMMITTEES):
+        if _SKIP_RE.search(committee_name.upper()):
             continue
 
         amount = item.get("expenditure_amount", 0) or 0
@@ -118,9 +196,8 @@ def get_independent_expenditures(candidate_id):
                 "support_oppose": "O",
             })
 
-    # Sort by amount, take top 5
-    top_spenders.sort(key=lambda x: x["amount"], reverse=True)
-    top_spenders = top_spenders[:5]
+    # Top 5 without sorting the full list: O(n log k) instead of O(n log n)
+    top_spenders = heapq.nlargest(5, top_spenders, key=lambda x: x["amount"])
 
     return {
         "support": round(total_support, 2),
@@ -141,22 +218,48 @@ def _format_money(amount):
         return f"${amount:,.0f}"
 
 
-def enrich_candidates_with_outside_spending(candidates):
+def _fetch_outside_spending(candidate, limiter):
+    """Fetch IE data for one candidate. Runs on a worker thread; all API
+    calls wait on the shared limiter so the pool stays under the FEC quota."""
+    limiter.acquire()
+    return get_independent_expenditures(candidate["fec_id"])
+
+
+def enrich_candidates_with_outside_spending(candidates, max_workers=6):
     """
     Add independent expenditure data to candidates who raised above threshold.
     Only fetches for competitive races to stay within rate limits.
+    Requests run on a thread pool so in-flight overlap hides API latency;
+    the shared token-bucket limiter keeps the aggregate rate within quota.
     """
     # Load cache
     ie_cache_path = CACHE_DIR / "ie_cache.json"
+    ie_journal_path = CACHE_DIR / "ie_cache.jsonl"
     ie_cache = {}
     if ie_cache_path.exists():
         try:
-            with open(ie_cache_path, encoding="utf-8") as f:
-                ie_cache = json.load(f)
+            ie_cache = orjson.loads(ie_cache_path.read_bytes())
             print(f"  Loaded IE cache with {len(ie_cache)} candidates")
-        except (json.JSONDecodeError, OSError):
+        except (orjson.JSONDecodeError, OSError):
             ie_cache = {}
 
+    # Replay journal entries from a previous run that died mid-fetch
+    if ie_journal_path.exists():
+        replayed = 0
+        with open(ie_journal_path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rec = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # Partial line from a crash mid-write
+                ie_cache[rec["fec_id"]] = rec["entry"]
+                replayed += 1
+        if replayed:
+            print(f"  Replayed {replayed} journal entries from interrupted run")
+
     # Count eligible candidates
     eligible = [
         c for c in candidates
@@ -166,48 +269,87 @@ def enrich_candidates_with_outside_spending(candidates):
 
     print(f"\n  Fetching outside spending for {len(eligible)} candidates (raised >= ${OUTSIDE_SPENDING_THRESHOLD:,})...")
 
-    request_count = 0
+    global _active_limiter
     cache_hits = 0
     start_time = time.time()
     found_count = 0
-
-    for i, candidate in enumerate(eligible):
+    failed_count = 0
+    limiter = RateLimiter()
+    _active_limiter = limiter
+    cache_lock = threading.Lock()
+
+    # Resolve cached candidates up front; queue the rest for workers.
+    # Entries carry a fetched_at stamp — stale ones (and legacy unwrapped
+    # ones) count as misses and get refetched.
+    ttl = IE_CACHE_TTL_DAYS * 86400
+    stale_before = time.time() - ttl
+    to_fetch = []
+    for candidate in eligible:
         fec_id = candidate["fec_id"]
-
-        # Check cache
-        if fec_id in ie_cache:
-            spending = ie_cache[fec_id]
+        entry = ie_cache.get(fec_id)
+        if (
+            isinstance(entry, dict)
+            and entry.get("fetched_at", 0) > stale_before
+        ):
+            spending = entry["payload"]
             if spending and (spending.get("support", 0) > 0 or spending.get("oppose", 0) > 0):
                 candidate["outside_spending"] = spending
                 found_count += 1
             cache_hits += 1
-            continue
+        else:
+            to_fetch.append(candidate)
 
-        if i % 50 == 0 and i > 0:
-            elapsed = time.time() - start_time
-            rate = request_count / max(elapsed / 60, 0.1) if request_count else 0
-            print(f"\n  --- {i}/{len(eligible)} ({rate:.0f} req/min) ---", flush=True)
-
-        # Rate limit: 14 req/min
-        request_count += 1
-        elapsed = time.time() - start_time
-        expected_time = request_count * (60.0 / 14)
-        if elapsed < expected_time:
-            time.sleep(expected_time - elapsed)
-
-        spending = get_independent_expenditures(fec_id)
-        ie_cache[fec_id] = spending
-        if spending and (spending["support"] > 0 or spending["oppose"] > 0):
-            candidate["outside_spending"] = spending
-            found_count += 1
-
-    # Save cache
+    done = 0
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    with open(ie_cache_path, "w", encoding="utf-8") as f:
-        json.dump(ie_cache, f)
+    journal = open(ie_journal_path, "ab")
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(_fetch_outside_spending, c, limiter): c
+                for c in to_fetch
+            }
+            for future in as_completed(futures):
+                candidate = futures[future]
+                done += 1
+                try:
+                    spending = future.result()
+                except Exception as e:
+                    print(f"    {candidate['name']}: ERROR - {e}", flush=True)
+                    continue
+
+                # Failed fetches are not cached, so the next run retries
+                # them instead of treating them as "no IE activity"
+                if spending is FETCH_FAILED:
+                    failed_count += 1
+                    continue
+
+                # Append one journal line per result so a killed run
+                # resumes from the last finished candidate
+                entry = {"fetched_at": time.time(), "payload": spending}
+                with cache_lock:
+                    ie_cache[candidate["fec_id"]] = entry
+                    journal.write(orjson.dumps(
+                        {"fec_id": candidate["fec_id"], "entry": entry}
+                    ) + b"\n")
+                    journal.flush()
+                if spending and (spending["support"] > 0 or spending["oppose"] > 0):
+                    candidate["outside_spending"] = spending
+                    found_count += 1
+
+                if done % 50 == 0:
+                    elapsed = time.time() - start_time
+                    rate = limiter.count / max(elapsed / 60, 0.1)
+                    print(f"\n  --- {done}/{len(to_fetch)} ({rate:.0f} req/min) ---", flush=True)
+    finally:
+        journal.close()
+        _active_limiter = None
+
+    # Compact: fold the journal into the main cache file
+    ie_cache_path.write_bytes(orjson.dumps(ie_cache))
+    ie_journal_path.unlink(missing_ok=True)
 
     elapsed = time.time() - start_time
-    print(f"\n  Outside spending: {found_count}/{len(eligible)} with IE data ({request_count} API calls, {cache_hits} cached, {elapsed/60:.1f} min)")
+    print(f"\n  Outside spending: {found_count}/{len(eligible)} with IE data ({limiter.count} API calls, {cache_hits} cached, {failed_count} failed, {elapsed/60:.1f} min)")
     return candidates
 
 
@@ -219,8 +361,7 @@ if __name__ == "__main__":
     # Load cached candidates to find a test case
     cache_path = CACHE_DIR / "candidates_raw.json"
     if cache_path.exists():
-        with open(cache_path, encoding="utf-8") as f:
-            candidates = json.load(f)
+        candidates = orjson.loads(cache_path.read_bytes())
 
         # Find a well-funded Senate candidate
         for c in candidates:
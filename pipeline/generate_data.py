@@ -2,9 +2,14 @@
 Main orchestrator: runs all pipeline steps and outputs static JSON for the frontend.
 """
 
-import json
+import gzip
+import hashlib
+import orjson
+import os
+import re
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
 # Add pipeline dir to path
@@ -21,6 +26,90 @@ from fetch_ftm_finance import enrich_governors_with_ftm
 from fetch_independent_expenditures import enrich_candidates_with_outside_spending
 
 
+def _stream_json_object(path, items):
+    """
+    Write a JSON object to `path` incrementally, one serialized value at
+    a time. Emitting race-by-race means the multi-MB output never exists
+    as one bytes buffer on top of the Python dicts being serialized.
+
+    The bytes are hashed while streaming to a temp file; if the content
+    matches the previous run (sidecar hash in CACHE_DIR), the temp file
+    is discarded and `path` keeps its mtime, so unchanged data doesn't
+    churn the CDN or trigger pointless redeploys. Returns True if `path`
+    was rewritten.
+
+    A pre-gzipped sibling (`path` + ".gz") is written in the same pass so
+    the CDN can serve Content-Encoding: gzip without compressing per
+    request. mtime=0 keeps the .gz bytes deterministic for a given input.
+    """
+    tmp_path = path.with_suffix(path.suffix + ".part")
+    gz_path = path.with_suffix(path.suffix + ".gz")
+    gz_tmp_path = gz_path.with_suffix(".gz.part")
+    digest = hashlib.blake2b(digest_size=16)
+    with open(tmp_path, "wb") as f, open(gz_tmp_path, "wb") as gz_raw, \
+            gzip.GzipFile(fileobj=gz_raw, mode="wb", compresslevel=9, mtime=0) as gz:
+        def emit(data):
+            digest.update(data)
+            f.write(data)
+            gz.write(data)
+
+        emit(b"{")
+        first = True
+        for key, value in items:
+            if first:
+                first = False
+            else:
+                emit(b",")
+            emit(orjson.dumps(key))
+            emit(b":")
+            emit(orjson.dumps(value))
+        emit(b"}")
+
+    new_hash = digest.hexdigest()
+    hash_path = CACHE_DIR / (path.name + ".hash")
+    if path.exists() and hash_path.exists() and hash_path.read_text() == new_hash:
+        tmp_path.unlink()
+        if gz_path.exists():
+            gz_tmp_path.unlink()
+        else:
+            gz_tmp_path.replace(gz_path)  # Backfill a missing sibling
+        return False
+
+    tmp_path.replace(path)
+    gz_tmp_path.replace(gz_path)
+    hash_path.write_text(new_hash)
+    return True
+
+
+# "Last, First ..." parser for dedup keys: one C-level scan instead of
+# lower/split/strip/split per call
+_DEDUP_RE = re.compile(r"([^,]+?)\s*,\s*([^\s,]+)?")
+
+
+@lru_cache(maxsize=4096)
+def _dedup_key(name):
+    """Normalize name for dedup: lowercase, last name + first name only."""
+    m = _DEDUP_RE.match(name.lower())
+    if m:
+        return f"{m.group(1).strip()},{m.group(2) or ''}"
+    return name.lower().strip()
+
+
+@lru_cache(maxsize=None)
+def _race_key_label(state, office, district):
+    """Race key and display label for a (state, office, district) triple.
+    Cached because every candidate in a race re-derives the same pair."""
+    state_name = STATE_NAMES.get(state, state)
+    if office == "Governor":
+        return f"{state}-governor", f"Governor - {state_name}"
+    if office == "U.S. Senate":
+        return f"{state}-senate", f"U.S. Senate - {state_name}"
+    district = (district or "00").lstrip("0") or "AL"
+    if district == "AL":
+        return f"{state}-house-AL", f"U.S. House - {state_name} (At-Large)"
+    return f"{state}-house-{district}", f"U.S. House - {state_name}, District {district}"
+
+
 def _format_money(amount):
     """Format dollar amount for display."""
     if amount >= 1_000_000:
@@ -31,6 +120,49 @@ def _format_money(amount):
         return f"${amount:,.0f}"
 
 
+_EMPTY = {}
+_EMPTY_LIST = []  # Shared read-only default; never mutated by consumers
+
+
+def _candidate_row(c, state, office):
+    """
+    Build the frontend row for one enriched candidate. Shared with
+    refresh.rebuild_data so the two pipeline variants emit identical rows.
+    """
+    totals = c.get("totals") or _EMPTY
+    donors = c.get("donors") or _EMPTY_LIST
+    total_raised = totals.get("total_raised", 0)
+    total_spent = totals.get("total_spent", 0)
+    fec_id = c.get("fec_id", "")
+    return {
+        "name": c["name"],
+        # Intern the small categoricals: candidates repeat the same few
+        # party strings, so duplicates parsed out of JSON collapse to one
+        # object each (fetch_governors does the same at parse time)
+        "party": sys.intern(c["party"]),
+        "party_full": sys.intern(c.get("party_full", "")),
+        "state": state,
+        "district": c.get("district"),
+        "office": office,
+        "incumbent": c.get("incumbent", False),
+        "fec_id": fec_id,
+        "total_raised": total_raised,
+        "total_raised_display": c.get(
+            "total_raised_display", _format_money(total_raised) if total_raised > 0 else "$0"
+        ),
+        "total_spent": total_spent,
+        "total_spent_display": _format_money(total_spent) if total_spent > 0 else "$0",
+        "cash_on_hand": totals.get("cash_on_hand", 0),
+        "funding_breakdown": c.get("funding_breakdown", {}),
+        "top_donors": donors[:5],  # Top 5 for summary
+        "all_donors": donors,  # Full list for detail view
+        "outside_spending": c.get("outside_spending", {}),
+        "fec_url": f"https://www.fec.gov/data/candidate/{fec_id}/" if fec_id else "",
+        "tusa_url": c.get("tusa_url", ""),
+        "state_disclosure_url": STATE_DISCLOSURE_URLS.get(state, "") if office == "Governor" else "",
+    }
+
+
 def build_candidates_json(candidates):
     """
     Transform enriched candidates into the frontend JSON format.
@@ -40,25 +172,13 @@ def build_candidates_json(candidates):
     races = {}
 
     for c in candidates:
-        state = c["state"]
-        office = c["office"]
-
-        if office == "Governor":
-            race_key = f"{state}-governor"
-            race_label = f"Governor - {STATE_NAMES.get(state, state)}"
-        elif office == "U.S. Senate":
-            race_key = f"{state}-senate"
-            race_label = f"U.S. Senate - {STATE_NAMES.get(state, state)}"
-        else:
-            district = c.get("district", "00").lstrip("0") or "AL"
-            race_key = f"{state}-house-{district}"
-            if district == "AL":
-                race_label = f"U.S. House - {STATE_NAMES.get(state, state)} (At-Large)"
-            else:
-                race_label = f"U.S. House - {STATE_NAMES.get(state, state)}, District {district}"
+        state = sys.intern(c["state"])
+        office = sys.intern(c["office"])
+        race_key, race_label = _race_key_label(state, office, c.get("district"))
 
-        if race_key not in races:
-            races[race_key] = {
+        race = races.get(race_key)
+        if race is None:
+            race = races[race_key] = {
                 "race_key": race_key,
                 "label": race_label,
                 "state": state,
@@ -67,61 +187,27 @@ def build_candidates_json(candidates):
             }
 
         # Clean up candidate for frontend (remove internal fields)
-        totals = c.get("totals") or {}
-        total_raised = totals.get("total_raised", 0)
-        total_spent = totals.get("total_spent", 0)
-
-        candidate_data = {
-            "name": c["name"],
-            "party": c["party"],
-            "party_full": c.get("party_full", ""),
-            "state": state,
-            "district": c.get("district"),
-            "office": office,
-            "incumbent": c.get("incumbent", False),
-            "fec_id": c.get("fec_id", ""),
-            "total_raised": total_raised,
-            "total_raised_display": c.get("total_raised_display", "$0"),
-            "total_spent": total_spent,
-            "total_spent_display": _format_money(total_spent) if total_spent > 0 else "$0",
-            "cash_on_hand": totals.get("cash_on_hand", 0),
-            "funding_breakdown": c.get("funding_breakdown", {}),
-            "top_donors": c.get("donors", [])[:5],  # Top 5 for summary
-            "all_donors": c.get("donors", []),  # Full list for detail view
-            "outside_spending": c.get("outside_spending", {}),
-            "fec_url": f"https://www.fec.gov/data/candidate/{c['fec_id']}/" if c.get("fec_id") else "",
-            "tusa_url": c.get("tusa_url", ""),
-            "state_disclosure_url": STATE_DISCLOSURE_URLS.get(state, "") if office == "Governor" else "",
-        }
-
-        races[race_key]["candidates"].append(candidate_data)
+        race["candidates"].append(_candidate_row(c, state, office))
 
     # Deduplicate: same person in same race = keep best entry
     # Normalize names to catch "Faris, Michael" vs "Faris, Michael James"
-    import re
-
-    def _dedup_key(name):
-        """Normalize name for dedup: lowercase, last name + first name only."""
-        parts = name.lower().split(",")
-        if len(parts) >= 2:
-            last = parts[0].strip()
-            first = parts[1].strip().split()[0] if parts[1].strip() else ""
-            return f"{last},{first}"
-        return name.lower().strip()
-
     for race in races.values():
-        seen = {}
+        # Sort best-first once, then keep the first entry per key: one
+        # score tuple per candidate instead of a compare-and-swap per
+        # collision. This is also the frontend display order (incumbents
+        # first, then by total raised), so no re-sort is needed at the end.
+        race["candidates"].sort(
+            key=lambda c: (c["incumbent"], c["total_raised"] or 0, len(c.get("all_donors", []))),
+            reverse=True,
+        )
+        seen = set()
+        kept = []
         for c in race["candidates"]:
             key = _dedup_key(c["name"])
-            if key in seen:
-                prev = seen[key]
-                prev_score = (prev["incumbent"], len(prev.get("all_donors", [])), prev["total_raised"] or 0)
-                curr_score = (c["incumbent"], len(c.get("all_donors", [])), c["total_raised"] or 0)
-                if curr_score > prev_score:
-                    seen[key] = c
-            else:
-                seen[key] = c
-        race["candidates"] = list(seen.values())
+            if key not in seen:
+                seen.add(key)
+                kept.append(c)
+        race["candidates"] = kept
 
     # Remove cross-race ghosts: if same person appears in Senate AND House,
     # drop the entry with $0 raised (abandoned filing)
@@ -135,7 +221,7 @@ def build_candidates_json(candidates):
                 all_by_name[person_key] = []
             all_by_name[person_key].append((race_key, c))
 
-    remove_from = []  # (race_key, fec_id) pairs to remove
+    drop = set()  # (race_key, fec_id) pairs to remove
     for person_key, entries in all_by_name.items():
         if len(entries) <= 1:
             continue
@@ -144,34 +230,55 @@ def build_candidates_json(candidates):
         no_money = [(rk, c) for rk, c in entries if (c.get("total_raised") or 0) == 0]
         if has_money and no_money:
             for rk, c in no_money:
-                remove_from.append((rk, c["fec_id"]))
+                drop.add((rk, c["fec_id"]))
 
-    for race_key, fec_id in remove_from:
-        if race_key in races:
-            races[race_key]["candidates"] = [
-                c for c in races[race_key]["candidates"] if c["fec_id"] != fec_id
+    if drop:
+        for race_key, race in races.items():
+            race["candidates"] = [
+                c for c in race["candidates"] if (race_key, c["fec_id"]) not in drop
             ]
 
-    # Sort candidates within each race: incumbents first, then by total raised
-    for race in races.values():
-        race["candidates"].sort(
-            key=lambda x: (not x["incumbent"], -(x["total_raised"] or 0))
-        )
+    # Candidates are already in display order: the dedup sort above is
+    # score-descending and the ghost filter preserves order
+    if __debug__:
+        for race in races.values():
+            cands = race["candidates"]
+            assert all(
+                (not cands[i]["incumbent"], -(cands[i]["total_raised"] or 0))
+                <= (not cands[i + 1]["incumbent"], -(cands[i + 1]["total_raised"] or 0))
+                for i in range(len(cands) - 1)
+            ), f"race {race['race_key']} lost its sort order"
 
     output_path = DATA_DIR / "candidates.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(races, f, separators=(",", ":"))
-
-    print(f"\n  Saved {len(races)} races to {output_path}")
-    print(f"  File size: {output_path.stat().st_size / 1024:.0f} KB")
+    if _stream_json_object(output_path, races.items()):
+        print(f"\n  Saved {len(races)} races to {output_path}")
+        print(f"  File size: {output_path.stat().st_size / 1024:.0f} KB")
+    else:
+        print(f"\n  No changes to {output_path}; skipped write")
 
     return races
 
 
+def _write_metadata_file(metadata):
+    """
+    Write metadata.json compactly - the frontend never renders the raw
+    bytes, so indentation only inflates the payload. Set
+    WPT_PRETTY_METADATA to also emit an indented metadata.pretty.json
+    for debugging.
+    """
+    output_path = DATA_DIR / "metadata.json"
+    output_path.write_bytes(orjson.dumps(metadata))
+    if os.environ.get("WPT_PRETTY_METADATA"):
+        (DATA_DIR / "metadata.pretty.json").write_bytes(
+            orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
+        )
+    return output_path
+
+
 def build_metadata_json():
     """Save metadata about when data was last updated."""
     metadata = {
-        "last_updated": datetime.utcnow().isoformat() + "Z",
+        "last_updated": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
         "data_sources": [
             "Federal Election Commission (FEC)",
             "Ballotpedia",
@@ -185,9 +292,7 @@ def build_metadata_json():
         "disclaimer": "This tool presents publicly available campaign finance records from federal and state sources. It is non-partisan and does not endorse or oppose any candidate.",
     }
 
-    output_path = DATA_DIR / "metadata.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(metadata, f, indent=2)
+    output_path = _write_metadata_file(metadata)
 
     print(f"  Saved metadata to {output_path}")
     return metadata
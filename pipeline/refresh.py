@@ -9,19 +9,19 @@ Usage:
 """
 
 import argparse
-import json
+import orjson
 import os
 import subprocess
 import sys
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
 # Add pipeline dir to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import DATA_DIR, CACHE_DIR, STATE_NAMES, STATE_DISCLOSURE_URLS
-from fetch_governor_finance import enrich_governors_with_finance, _format_dollar
+from config import DATA_DIR, CACHE_DIR, STATE_NAMES
+from fetch_governor_finance import enrich_governors_with_finance
 from fetch_state_finance import enrich_governors_with_state_finance
 
 
@@ -62,17 +62,18 @@ def refresh_governors():
 
 def rebuild_data(governors_only=False):
     """Rebuild the frontend candidates.json file."""
+    from generate_data import _candidate_row, _stream_json_object, _write_metadata_file
+
     print("\n" + "=" * 50)
     print("REBUILDING FRONTEND DATA")
     print("=" * 50)
 
-    # Load existing data
+    # Load existing data (orjson parses the multi-MB file straight from
+    # bytes, skipping the text decode of stdlib json.load)
     candidates_path = DATA_DIR / "candidates.json"
-    if candidates_path.exists():
-        with open(candidates_path, encoding="utf-8") as f:
-            existing_races = json.load(f)
-    else:
-        existing_races = {}
+    existing_races = (
+        orjson.loads(candidates_path.read_bytes()) if candidates_path.exists() else {}
+    )
 
     fed_races = {k: v for k, v in existing_races.items() if not k.endswith("-governor")}
     print(f"  Federal races: {len(fed_races)}")
@@ -96,27 +97,7 @@ def rebuild_data(governors_only=False):
                 "candidates": [],
             }
 
-        total = c.get("totals", {}).get("total_raised", 0) if c.get("totals") else 0
-        candidate_data = {
-            "name": c["name"],
-            "party": c["party"],
-            "party_full": c.get("party_full", ""),
-            "state": state,
-            "district": None,
-            "office": "Governor",
-            "incumbent": c.get("incumbent", False),
-            "fec_id": "",
-            "total_raised": total,
-            "total_raised_display": c.get("total_raised_display", _format_dollar(total) if total > 0 else "$0"),
-            "cash_on_hand": 0,
-            "funding_breakdown": c.get("funding_breakdown", {}),
-            "top_donors": c.get("donors", [])[:5],
-            "all_donors": c.get("donors", []),
-            "fec_url": "",
-            "tusa_url": c.get("tusa_url", ""),
-            "state_disclosure_url": STATE_DISCLOSURE_URLS.get(state, ""),
-        }
-        gov_races[race_key]["candidates"].append(candidate_data)
+        gov_races[race_key]["candidates"].append(_candidate_row(c, state, "Governor"))
 
     # Sort candidates: incumbents first, then by total raised
     for race in gov_races.values():
@@ -126,22 +107,22 @@ def rebuild_data(governors_only=False):
     merged = {**fed_races, **gov_races}
 
     # Save
-    with open(candidates_path, "w", encoding="utf-8") as f:
-        json.dump(merged, f, separators=(",", ":"))
-    file_size = candidates_path.stat().st_size / 1024
-    print(f"\n  Saved: {len(merged)} races, {file_size:.0f} KB")
+    if _stream_json_object(candidates_path, merged.items()):
+        file_size = candidates_path.stat().st_size / 1024
+        print(f"\n  Saved: {len(merged)} races, {file_size:.0f} KB")
+    else:
+        print("\n  Candidates unchanged; skipped write")
 
     # Update metadata
     metadata = {
-        "last_updated": datetime.now().isoformat(),
+        "last_updated": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
         "total_races": len(merged),
         "federal_races": len(fed_races),
         "governor_races": len(gov_races),
         "election_year": 2026,
         "data_sources": ["FEC API", "Ballotpedia", "TransparencyUSA"],
     }
-    with open(DATA_DIR / "metadata.json", "w", encoding="utf-8") as f:
-        json.dump(metadata, f, indent=2)
+    _write_metadata_file(metadata)
 
     return merged
 
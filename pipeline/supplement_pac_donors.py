@@ -5,38 +5,41 @@ Requires committee_id lookup, then filters out fundraising platforms
 """
 
 import json
+import orjson
+import re
 import sys
+import threading
 import time
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from config import DATA_DIR
-from fetch_donors import fec_get
+import fetch_donors
+from config import CACHE_DIR, DATA_DIR
+from fetch_donors import RateLimiter, fec_get
 
 # Fundraising platforms and transfer sources to filter out
 FILTER_NAMES = {
     "WINRED", "ACTBLUE", "ACTBLUE TECHNICAL SERVICES",
 }
 
+# Joint fundraising committee markers ("VICTORY FUND", etc.)
+JFC_KEYWORDS = ["VICTORY FUND", "VICTORY COMMITTEE", "JOINT FUNDRAISING"]
 
-def is_jfc_or_platform(name, candidate_name=""):
-    """Check if a contributor is a fundraising platform or joint fundraising committee."""
-    name_upper = name.upper()
+# One compiled alternation scans the name in a single C-level pass
+# instead of six chained `in` checks per donor row
+_FILTER_RE = re.compile("|".join(map(re.escape, [*sorted(FILTER_NAMES), *JFC_KEYWORDS])))
 
-    # Filter out fundraising platforms
-    for f in FILTER_NAMES:
-        if f in name_upper:
-            return True
+_EMPTY = {}
 
-    # Filter out joint fundraising committees (contain "VICTORY FUND", "VICTORY COMMITTEE", etc.)
-    jfc_keywords = ["VICTORY FUND", "VICTORY COMMITTEE", "JOINT FUNDRAISING"]
-    for kw in jfc_keywords:
-        if kw in name_upper:
-            return True
 
-    return False
+def is_jfc_or_platform(name_upper, candidate_name=""):
+    """Check if a contributor is a fundraising platform or joint fundraising
+    committee. Takes the already-uppercased name so callers scanning many
+    rows pay for one str.upper per row."""
+    return _FILTER_RE.search(name_upper) is not None
 
 
 def get_principal_committee_id(candidate_id):
@@ -71,28 +74,22 @@ def get_real_pac_donors(committee_id, candidate_name=""):
     if not data or not data.get("results"):
         return []
 
-    # Aggregate by contributor name
-    by_name = defaultdict(lambda: {"total": 0, "count": 0})
+    # Aggregate by contributor name; Counter addition is C-level, and
+    # most_common replaces the full sort + slice for the top 10
+    totals = Counter()
     for r in data["results"]:
         name = (r.get("contributor_name") or "").strip()
         amount = r.get("contribution_receipt_amount", 0) or 0
         if not name or amount <= 0:
             continue
-        if is_jfc_or_platform(name, candidate_name):
+        if is_jfc_or_platform(name.upper(), candidate_name):
             continue
-        by_name[name]["total"] += amount
-        by_name[name]["count"] += 1
+        totals[name] += amount
 
-    donors = []
-    for name, d in by_name.items():
-        donors.append({
-            "name": name.title(),
-            "amount": round(d["total"], 2),
-            "type": "pac",
-        })
-
-    donors.sort(key=lambda x: x["amount"], reverse=True)
-    return donors[:10]
+    return [
+        {"name": name.title(), "amount": round(total, 2), "type": "pac"}
+        for name, total in totals.most_common(10)
+    ]
 
 
 def supplement_existing_candidates_json():
@@ -109,92 +106,115 @@ def supplement_existing_candidates_json():
         races = json.load(f)
 
     # Extract candidates that need PAC data
-    all_candidates = []
-    for race in races.values():
-        for c in race["candidates"]:
-            all_candidates.append(c)
-
-    # Filter: only candidates with meaningful PAC funding
-    pac_candidates = []
-    for c in all_candidates:
-        fec_id = c.get("fec_id", "")
-        total = c.get("total_raised", 0)
-        pac_pct = c.get("funding_breakdown", {}).get("pac", 0)
-        if fec_id and total > 50000 and pac_pct > 2:
-            pac_candidates.append(c)
+    all_candidates = [c for race in races.values() for c in race["candidates"]]
+
+    # Filter: only candidates with meaningful PAC funding. The shared
+    # _EMPTY fallback avoids allocating a throwaway dict per candidate.
+    pac_candidates = [
+        c for c in all_candidates
+        if c.get("fec_id")
+        and (c.get("total_raised") or 0) > 50000
+        and (c.get("funding_breakdown") or _EMPTY).get("pac", 0) > 2
+    ]
 
     print(f"Loaded {len(all_candidates)} total candidates from {len(races)} races")
     print(f"Targeting {len(pac_candidates)} candidates with PAC% > 2% and raised > $50K")
-    print(f"Estimated: {len(pac_candidates) * 2} API calls (~{len(pac_candidates) * 2 / 14:.0f} minutes)")
 
-    request_count = 0
     start_time = time.time()
     pac_found = 0
-    committee_cache = {}
 
-    def rate_limit_pause():
-        nonlocal request_count, start_time
-        request_count += 1
-        elapsed = time.time() - start_time
-        expected_time = request_count * (60.0 / 14)
-        if elapsed < expected_time:
-            time.sleep(expected_time - elapsed)
-
-    for i, c in enumerate(pac_candidates):
+    # Committee IDs never change, so the lookup cache persists across runs.
+    # Negative lookups are stored as "" so missing candidates aren't re-queried.
+    cmte_cache_path = CACHE_DIR / "committee_ids.json"
+    committee_cache = {}
+    if cmte_cache_path.exists():
+        committee_cache = orjson.loads(cmte_cache_path.read_bytes())
+        print(f"Committee-ID cache: {len(committee_cache)} entries")
+
+    # Shared adaptive limiter: workers overlap HTTP round trips while the
+    # token bucket keeps the aggregate request rate within the FEC budget.
+    # fec_get lives in fetch_donors, so hook its limiter feedback there.
+    limiter = RateLimiter()
+    fetch_donors._active_limiter = limiter
+    cache_lock = threading.Lock()
+
+    def process_one(c):
+        """Committee lookup + PAC donor fetch for one candidate (worker thread)."""
         fec_id = c["fec_id"]
-
-        if i % 50 == 0:
-            elapsed = time.time() - start_time
-            rate = request_count / max(elapsed / 60, 0.1) if request_count else 0
-            print(f"\n  --- {i}/{len(pac_candidates)} ({rate:.0f} req/min) ---", flush=True)
-
-        print(f"  [{i + 1}/{len(pac_candidates)}] {c['name']} (PAC: {c.get('funding_breakdown', {}).get('pac', 0)}%)...", end=" ", flush=True)
-
-        try:
-            # Step 1: Get committee ID
-            if fec_id in committee_cache:
-                cmte_id = committee_cache[fec_id]
-            else:
-                rate_limit_pause()
-                cmte_id = get_principal_committee_id(fec_id)
+        with cache_lock:
+            cmte_id = committee_cache.get(fec_id)
+        if cmte_id is None:
+            limiter.acquire()
+            cmte_id = get_principal_committee_id(fec_id) or ""
+            with cache_lock:
                 committee_cache[fec_id] = cmte_id
-
-            if not cmte_id:
-                print("no committee")
-                continue
-
-            # Step 2: Get PAC donors
-            rate_limit_pause()
-            pac_donors = get_real_pac_donors(cmte_id, c["name"])
-
-            if pac_donors:
-                # Merge with existing donors
-                existing = c.get("all_donors", [])
-                combined = existing + pac_donors
-                combined.sort(key=lambda x: x["amount"], reverse=True)
-                c["all_donors"] = combined[:10]
-                c["top_donors"] = combined[:5]
-                pac_found += 1
-                top = pac_donors[0]["name"] if pac_donors else ""
-                print(f"{len(pac_donors)} PACs (top: {top})")
-            else:
-                print("no real PACs")
-
-        except Exception as e:
-            print(f"ERROR: {e}")
+        if not cmte_id:
+            return None, "no committee"
+
+        limiter.acquire()
+        pac_donors = get_real_pac_donors(cmte_id, c["name"])
+        if not pac_donors:
+            return None, "no real PACs"
+        return pac_donors, f"{len(pac_donors)} PACs (top: {pac_donors[0]['name']})"
+
+    done = 0
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = {pool.submit(process_one, c): c for c in pac_candidates}
+            for future in as_completed(futures):
+                c = futures[future]
+                done += 1
+                try:
+                    pac_donors, status = future.result()
+                except Exception as e:
+                    pac_donors, status = None, f"ERROR: {e}"
+
+                # Merge on the main thread: candidate dicts stay single-writer
+                if pac_donors:
+                    combined = c.get("all_donors", []) + pac_donors
+                    combined.sort(key=lambda x: x["amount"], reverse=True)
+                    c["all_donors"] = combined[:10]
+                    c["top_donors"] = combined[:5]
+                    pac_found += 1
+
+                print(f"  [{done}/{len(pac_candidates)}] {c['name']}: {status}", flush=True)
+    finally:
+        fetch_donors._active_limiter = None
+
+    # Persist committee IDs for the next run (atomic: write + rename)
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = cmte_cache_path.with_suffix(".json.part")
+    tmp_path.write_bytes(orjson.dumps(committee_cache))
+    tmp_path.replace(cmte_cache_path)
 
     elapsed = time.time() - start_time
-    print(f"\n  Done: {request_count} API calls in {elapsed/60:.1f} minutes")
+    print(f"\n  Done: {limiter.count} API calls in {elapsed/60:.1f} minutes")
     print(f"  PAC donors added for {pac_found}/{len(pac_candidates)} candidates")
 
-    # Save updated races
-    with open(input_path, "w", encoding="utf-8") as f:
-        json.dump(races, f, separators=(",", ":"))
+    # Save updated races through the shared writer so the .gz sibling
+    # and hash sidecar stay in sync with candidates.json
+    from generate_data import _stream_json_object
 
-    print(f"  Updated {input_path}")
-    print(f"  File size: {input_path.stat().st_size / 1024:.0f} KB")
+    if _stream_json_object(input_path, races.items()):
+        print(f"  Updated {input_path}")
+        print(f"  File size: {input_path.stat().st_size / 1024:.0f} KB")
+    else:
+        print("  No changes to candidates.json; skipped write")
     print("\n=== READY TO REDEPLOY ===")
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Add real PAC donor names to candidates.json")
+    parser.add_argument("--clear-cmte-cache", action="store_true",
+                        help="Drop the persisted committee-ID cache before running")
+    args = parser.parse_args()
+
+    if args.clear_cmte_cache:
+        cache_path = CACHE_DIR / "committee_ids.json"
+        if cache_path.exists():
+            cache_path.unlink()
+            print(f"Cleared {cache_path}")
+
     supplement_existing_candidates_json()
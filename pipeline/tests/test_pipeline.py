@@ -1,5 +1,6 @@
 """Tests for the Who Pays Them pipeline."""
 
+import csv
 import json
 import sys
 from pathlib import Path
@@ -10,6 +11,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from config import PARTY_MAP, STATE_NAMES, SENATE_STATES_2026
 from fetch_districts import parse_census_crosswalk
 from fetch_donors import compute_funding_breakdown, format_money
+from fetch_governor_finance import _extract_nuxt_args
+from fetch_state_finance import _governor_lines
 
 
 class TestConfig:
@@ -99,3 +102,66 @@ class TestDonorUtils:
     def test_format_money_small(self):
         assert format_money(500) == "$500"
         assert format_money(0) == "$0"
+
+
+class TestNuxtArgsParser:
+    def test_tokenizes_all_value_types(self):
+        html = (
+            '<html><script>window.__NUXT__=(function(a,b,c,d,e,f,g,h,i,j)'
+            '{return {total:c}}('
+            '"Tom \\"Doc\\" Smith","path\\u002Fto",-42,-3.5,'
+            'Array(2),Array(),{},null,true,false));</script></html>'
+        )
+        args = _extract_nuxt_args(html)
+        assert args["a"] == 'Tom \\"Doc\\" Smith'
+        assert args["b"] == "path/to"
+        assert args["c"] == -42
+        assert args["d"] == -3.5
+        assert args["e"] == [None, None]
+        assert args["f"] == []
+        assert args["g"] == {}
+        assert args["h"] is None
+        assert args["i"] is True
+        assert args["j"] is False
+
+    def test_paren_variant_call_form(self):
+        # Some pages emit })(args); instead of }(args));
+        html = (
+            '<script>window.__NUXT__=(function(a,b)'
+            '{return {x:a}})("DEM",1500.0);</script>'
+        )
+        args = _extract_nuxt_args(html)
+        assert args == {"a": "DEM", "b": 1500.0}
+
+    def test_no_nuxt_blob(self):
+        assert _extract_nuxt_args("<html><body>nothing here</body></html>") == {}
+
+
+class TestGovernorLinePrefilter:
+    def test_passes_quoted_multiline_record(self):
+        lines = [
+            'A,"Committee to Elect\n',
+            'Someone Governor",100\n',
+            "B,Secretary of State,50\n",
+            "C,Governor of Oklahoma,25\n",
+        ]
+        kept = list(_governor_lines(lines))
+        assert kept == [lines[0], lines[1], lines[3]]
+
+    def test_multiline_record_reaches_csv_intact(self):
+        lines = [
+            'A,"Committee to Elect\n',
+            'Someone Governor",100\n',
+            "B,Secretary of State,50\n",
+        ]
+        rows = list(csv.reader(_governor_lines(lines)))
+        assert rows == [["A", "Committee to Elect\nSomeone Governor", "100"]]
+
+    def test_drops_non_governor_rows(self):
+        lines = [
+            "A,State Auditor,10\n",
+            "B,GOVERNOR,20\n",
+            "C,Lt. Governor,30\n",
+        ]
+        kept = list(_governor_lines(lines))
+        assert kept == [lines[1], lines[2]]
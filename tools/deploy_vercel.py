@@ -13,38 +13,133 @@ Prerequisites:
 
 import argparse
 import json
+import os
 import subprocess
 import sys
+import threading
+import time
+import requests
 from pathlib import Path
 
-
-def run(cmd, cwd=None, check=True):
-    """Run a shell command and return output."""
-    print(f"  $ {cmd}")
-    result = subprocess.run(
-        cmd, shell=True, cwd=cwd,
-        capture_output=True, text=True
-    )
-    if check and result.returncode != 0:
-        print(f"  ERROR: {result.stderr.strip()}")
+VERCEL_API = "https://api.vercel.com"
+
+# Auth checks spawn the Node-based Vercel CLI (~0.5s each); cache the
+# result so chained tool runs within the TTL skip both invocations
+AUTH_CACHE_TTL = 3600
+
+
+def _cache_dir():
+    """Per-user tool cache ($XDG_CACHE_HOME or ~/.cache)."""
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    path = Path(base) / "who-pays-them"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def run(argv, cwd=None, check=True):
+    """
+    Run a command (argv list, no shell), echoing output as it arrives.
+    Streaming keeps memory bounded for chatty children and shows progress
+    immediately. stdout and stderr stay separate because Vercel prints
+    the deploy URL on stdout and its build progress on stderr; returning
+    the last non-empty stdout line yields the URL, not a status line.
+    Returns that line, or None on failure.
+    """
+    print(f"  $ {' '.join(argv)}")
+    try:
+        proc = subprocess.Popen(
+            argv, cwd=cwd,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            bufsize=65536, text=True,
+        )
+    except FileNotFoundError:
+        print(f"  ERROR: {argv[0]} not found")
         return None
-    return result.stdout.strip()
-
 
-def check_vercel_cli():
-    """Verify Vercel CLI is installed and authenticated."""
-    version = run("vercel --version", check=False)
+    # Drain stderr on a side thread so neither pipe can fill and stall
+    # the child while the main thread reads stdout
+    def _drain_stderr():
+        for line in proc.stderr:
+            sys.stdout.write("    " + line)
+
+    stderr_thread = threading.Thread(target=_drain_stderr, daemon=True)
+    stderr_thread.start()
+
+    last_line = ""
+    for line in proc.stdout:
+        sys.stdout.write("    " + line)
+        if line.strip():
+            last_line = line.strip()
+    proc.wait()
+    stderr_thread.join()
+
+    if check and proc.returncode != 0:
+        print(f"  ERROR: exit code {proc.returncode}")
+        return None
+    return last_line
+
+
+def _api_request(method, path, payload=None):
+    """
+    Call the Vercel REST API using the VERCEL_TOKEN env var. One HTTPS
+    round trip instead of a ~0.5s Node CLI startup per operation.
+    Returns the parsed response, or None when no token is set or the
+    call fails (callers then fall back to the CLI).
+    """
+    token = os.environ.get("VERCEL_TOKEN", "")
+    if not token:
+        return None
+    try:
+        resp = requests.request(
+            method, f"{VERCEL_API}{path}",
+            headers={"Authorization": f"Bearer {token}"},
+            json=payload, timeout=30,
+        )
+    except requests.RequestException as e:
+        print(f"  Vercel API error: {e}")
+        return None
+    if resp.status_code >= 400:
+        print(f"  Vercel API error {resp.status_code}: {resp.text[:200]}")
+        return None
+    return resp.json()
+
+
+def check_vercel_cli(use_cli=False):
+    """Verify Vercel access: REST API when VERCEL_TOKEN is set, CLI otherwise."""
+    if not use_cli:
+        user = _api_request("GET", "/v2/user")
+        if user:
+            username = user.get("user", {}).get("username", "unknown")
+            print(f"  Vercel API: authenticated as {username}")
+            return True
+
+    cache_path = _cache_dir() / "vercel_auth.json"
+    if cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text())
+        except (json.JSONDecodeError, OSError):
+            cached = {}
+        if time.time() - cached.get("ts", 0) < AUTH_CACHE_TTL:
+            print(f"  Vercel CLI: {cached['version']} (cached)")
+            print(f"  Logged in as: {cached['whoami']} (cached)")
+            return True
+
+    version = run(["vercel", "--version"], check=False)
     if not version:
         print("ERROR: Vercel CLI not found. Install with: npm i -g vercel")
         return False
     print(f"  Vercel CLI: {version}")
 
     # Check auth
-    whoami = run("vercel whoami", check=False)
+    whoami = run(["vercel", "whoami"], check=False)
     if not whoami or "Error" in whoami:
         print("ERROR: Not logged in. Run: vercel login")
         return False
     print(f"  Logged in as: {whoami}")
+
+    cache_path.write_text(json.dumps(
+        {"version": version, "whoami": whoami, "ts": time.time()}
+    ))
     return True
 
 
@@ -56,9 +151,9 @@ def deploy(project_dir, production=True):
 
     print(f"\nDeploying {web_dir} to Vercel...")
 
-    cmd = "vercel --yes"
+    cmd = ["vercel", "--yes"]
     if production:
-        cmd += " --prod"
+        cmd.append("--prod")
 
     url = run(cmd, cwd=str(web_dir))
     if url:
@@ -66,14 +161,27 @@ def deploy(project_dir, production=True):
     return url
 
 
-def add_domain(project_dir, domain):
+def add_domain(project_dir, domain, use_cli=False):
     """Add a custom domain to the Vercel project."""
     web_dir = Path(project_dir) / "web"
     if not web_dir.exists():
         web_dir = Path(project_dir)
 
     print(f"\nAdding domain {domain}...")
-    result = run(f"vercel domains add {domain}", cwd=str(web_dir))
+
+    # API path: one POST against the linked project's domain endpoint
+    result = None
+    if not use_cli:
+        info = get_project_info(project_dir)
+        if info and info.get("projectId"):
+            path = f"/v10/projects/{info['projectId']}/domains"
+            org_id = info.get("orgId", "")
+            if org_id.startswith("team_"):
+                path += f"?teamId={org_id}"
+            result = _api_request("POST", path, {"name": domain})
+
+    if not result:
+        result = run(["vercel", "domains", "add", domain], cwd=str(web_dir))
     if result:
         print(f"  Domain added: {domain}")
         print(f"\n  Next step: Point your domain's DNS to Vercel:")
@@ -110,13 +218,15 @@ def main():
                         help="Deploy as preview (not production)")
     parser.add_argument("--info", action="store_true",
                         help="Show project info only")
+    parser.add_argument("--use-cli", action="store_true",
+                        help="Force the Vercel CLI even when VERCEL_TOKEN is set")
     args = parser.parse_args()
 
     print("=" * 50)
     print("Vercel Deployment Tool")
     print("=" * 50)
 
-    if not check_vercel_cli():
+    if not check_vercel_cli(use_cli=args.use_cli):
         sys.exit(1)
 
     if args.info:
@@ -129,7 +239,7 @@ def main():
         sys.exit(1)
 
     if args.domain:
-        add_domain(args.project_dir, args.domain)
+        add_domain(args.project_dir, args.domain, use_cli=args.use_cli)
 
     print("\n" + "=" * 50)
     print("Deployment complete!")
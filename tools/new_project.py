@@ -20,16 +20,63 @@ Prerequisites:
 
 import argparse
 import os
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+# Bump to force a fresh create-next-app hydration of the template cache
+TEMPLATE_VERSION = "1"
+
+
+def _cache_dir():
+    """Per-user tool cache ($XDG_CACHE_HOME or ~/.cache)."""
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    path = Path(base) / "who-pays-them"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def run(argv, cwd=None, check=True):
+    """
+    Run a command (argv list, no shell), echoing output as it arrives.
+    create-next-app and vercel both produce long chatty logs; streaming
+    bounds memory and shows progress immediately instead of after exit.
+    Returns the last non-empty line, or None on failure.
+    """
+    print(f"  $ {' '.join(argv)}")
+    try:
+        proc = subprocess.Popen(
+            argv, cwd=cwd,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            bufsize=65536, text=True,
+        )
+    except FileNotFoundError:
+        print(f"  ERROR: {argv[0]} not found")
+        return None
+
+    last_line = ""
+    for line in proc.stdout:
+        sys.stdout.write("    " + line)
+        if line.strip():
+            last_line = line.strip()
+    proc.wait()
+
+    if check and proc.returncode != 0:
+        print(f"  ERROR: exit code {proc.returncode}")
+        return None
+    return last_line
 
-def run(cmd, cwd=None, check=True):
-    """Run a shell command."""
-    print(f"  $ {cmd}")
+
+def run_batch(cmds, cwd=None, check=True):
+    """Run several commands joined with ' && ' under one shell - a single
+    shell startup instead of one fork+exec per command."""
+    joined = " && ".join(cmds)
+    print(f"  $ {joined}")
     result = subprocess.run(
-        cmd, shell=True, cwd=cwd,
+        joined, shell=True, cwd=cwd,
         capture_output=True, text=True
     )
     if check and result.returncode != 0:
@@ -38,9 +85,48 @@ def run(cmd, cwd=None, check=True):
     return result.stdout.strip()
 
 
+def _write(path, text):
+    """Create `path` with `text`: one open/write/close, no pathlib stat dance."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, text.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def _ensure_next_template():
+    """
+    Return a cached create-next-app output, hydrating it on first use.
+    create-next-app downloads a full node_modules every invocation; the
+    cached copy turns later scaffolds into a local copytree plus an
+    offline npm ci. Returns None if hydration fails.
+    """
+    template_dir = _cache_dir() / "next-template"
+    stamp = template_dir / ".template-version"
+    if stamp.exists() and stamp.read_text().strip() == TEMPLATE_VERSION:
+        return template_dir
+
+    if template_dir.exists():
+        shutil.rmtree(template_dir)
+    print("  Hydrating Next.js template cache (one-time)...")
+    result = run(["npx", "create-next-app@latest", template_dir.name,
+                  "--typescript", "--tailwind", "--app", "--no-src-dir",
+                  "--no-import-alias", "--yes"],
+                 cwd=str(template_dir.parent))
+    if result is None or not template_dir.exists():
+        return None
+    stamp.write_text(TEMPLATE_VERSION)
+    return template_dir
+
+
+# Single-pass space/underscore -> dash mapping for slugify
+_SLUG_TRANS = str.maketrans(" _", "--")
+
+
+@lru_cache(maxsize=8)
 def slugify(name):
     """Convert name to URL-safe slug."""
-    return name.lower().replace(" ", "-").replace("_", "-")
+    return name.lower().translate(_SLUG_TRANS)
 
 
 def scaffold_project(name, base_dir):
@@ -54,17 +140,32 @@ def scaffold_project(name, base_dir):
 
     print(f"\nScaffolding {name} at {project_dir}...")
 
-    # Create directories
-    project_dir.mkdir(parents=True)
-    (project_dir / "pipeline").mkdir()
-    (project_dir / "pipeline" / "tests").mkdir()
-    (project_dir / "tools").mkdir()
-    (project_dir / ".github" / "workflows").mkdir(parents=True)
+    # Create directories: parents=True lets each leaf pull in its whole
+    # chain, so three mkdir calls cover all five directories
+    for d in ("pipeline/tests", "tools", ".github/workflows"):
+        (project_dir / d).mkdir(parents=True)
 
-    # Create Next.js app
+    # Create Next.js app from the cached template when available; the
+    # npm ci reuses the global npm cache so the install stays offline
     print("  Creating Next.js app...")
-    run(f"npx create-next-app@latest web --typescript --tailwind --app --no-src-dir --no-import-alias --yes",
-        cwd=str(project_dir))
+    template_dir = _ensure_next_template()
+    if template_dir:
+        shutil.copytree(
+            template_dir, project_dir / "web",
+            ignore=shutil.ignore_patterns("node_modules", ".next", ".template-version"),
+        )
+        install_cmd = ["npm", "ci", "--prefer-offline", "--no-audit", "--no-fund"]
+        install_cwd = project_dir / "web"
+    else:
+        install_cmd = ["npx", "create-next-app@latest", "web", "--typescript",
+                       "--tailwind", "--app", "--no-src-dir", "--no-import-alias",
+                       "--yes"]
+        install_cwd = project_dir
+
+    # The install only touches web/, so let it run in the background
+    # while the pipeline skeleton is written and git is initialized
+    print(f"  $ {' '.join(install_cmd)} (in background)")
+    install_proc = subprocess.Popen(install_cmd, cwd=str(install_cwd))
 
     # Create pipeline config skeleton
     config = '''"""Central configuration for the {name} pipeline."""
@@ -80,8 +181,8 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 '''.format(name=name)
 
-    (project_dir / "pipeline" / "config.py").write_text(config, encoding="utf-8")
-    (project_dir / "pipeline" / "tests" / "__init__.py").write_text("", encoding="utf-8")
+    _write(project_dir / "pipeline" / "config.py", config)
+    _write(project_dir / "pipeline" / "tests" / "__init__.py", "")
 
     # Create .gitignore
     gitignore = """node_modules/
@@ -94,7 +195,7 @@ __pycache__/
 .cache/
 .vercel/
 """
-    (project_dir / ".gitignore").write_text(gitignore, encoding="utf-8")
+    _write(project_dir / ".gitignore", gitignore)
 
     # Create README
     readme = f"""# {name}
@@ -119,7 +220,14 @@ python tools/deploy_vercel.py
 python tools/setup_domain.py yourdomain.org
 ```
 """
-    (project_dir / "README.md").write_text(readme, encoding="utf-8")
+    _write(project_dir / "README.md", readme)
+
+    # Pre-emptive init: create_github_repo then only needs add + commit.
+    # -b main pins the branch name regardless of init.defaultBranch
+    run(["git", "init", "-b", "main"], cwd=str(project_dir))
+
+    if install_proc.wait() != 0:
+        print(f"  ERROR: web install exited {install_proc.returncode}")
 
     print(f"  Created project at {project_dir}")
     return project_dir
@@ -131,11 +239,36 @@ def create_github_repo(project_dir, name, public=True):
     visibility = "--public" if public else "--private"
 
     print(f"\nCreating GitHub repo: {slug}")
-    run("git init", cwd=str(project_dir))
-    run("git add -A", cwd=str(project_dir))
-    run('git commit -m "Initial scaffold"', cwd=str(project_dir))
-    run(f'gh repo create wjcornelius/{slug} {visibility} --source=. --push',
-        cwd=str(project_dir))
+    run_batch([
+        "git add -A",
+        'git commit -m "Initial scaffold"',
+    ], cwd=str(project_dir))
+
+    # One GraphQL mutation creates the repo, then a batched remote-add +
+    # push lands the commit: two round trips where `gh repo create
+    # --source=. --push` makes several REST calls plus its own push
+    viz = "PUBLIC" if public else "PRIVATE"
+    mutation = (
+        'mutation{createRepository(input:{name:"%s",visibility:%s})'
+        "{repository{url}}}" % (slug, viz)
+    )
+    created = run(["gh", "api", "graphql", "-f", f"query={mutation}"],
+                  cwd=str(project_dir), check=False)
+    if created and "https://github.com" in created:
+        # HEAD pushes whatever branch git init produced, so a host with
+        # init.defaultBranch unset (branch "master") still works
+        pushed = run_batch([
+            f"git remote add origin https://github.com/wjcornelius/{slug}.git",
+            "git push -u origin HEAD",
+        ], cwd=str(project_dir))
+    else:
+        # Older gh or API hiccup: the classic create+push still works
+        pushed = run(["gh", "repo", "create", f"wjcornelius/{slug}", visibility,
+                      "--source=.", "--push"],
+                     cwd=str(project_dir))
+    if pushed is None:
+        print(f"  ERROR: could not push to wjcornelius/{slug}")
+        return None
     return f"https://github.com/wjcornelius/{slug}"
 
 
@@ -160,21 +293,30 @@ def main():
     if not project_dir:
         sys.exit(1)
 
-    # 2. GitHub
-    if not args.no_github:
-        repo_url = create_github_repo(project_dir, args.name, public=not args.private)
-        if repo_url:
-            print(f"  GitHub: {repo_url}")
-
-    # 3. Deploy
-    if not args.no_deploy:
-        tools_dir = Path(__file__).parent
-        run(f"python {tools_dir / 'deploy_vercel.py'} --project-dir {project_dir}")
-
-    # 4. Domain
-    if args.domain:
-        tools_dir = Path(__file__).parent
-        run(f"python {tools_dir / 'setup_domain.py'} {args.domain}")
+    tools_dir = Path(__file__).parent
+
+    # 2+3. GitHub then Vercel deploy: the push must land before the deploy
+    # links the repo, so they stay chained on one worker
+    def github_then_deploy():
+        if not args.no_github:
+            repo_url = create_github_repo(project_dir, args.name, public=not args.private)
+            if repo_url:
+                print(f"  GitHub: {repo_url}")
+        if not args.no_deploy:
+            run([sys.executable, str(tools_dir / "deploy_vercel.py"),
+                 "--project-dir", str(project_dir)])
+
+    # 4. Porkbun DNS is independent of both, so it runs concurrently -
+    # the two network-bound steps overlap instead of running back to back
+    def configure_domain():
+        run([sys.executable, str(tools_dir / "setup_domain.py"), args.domain])
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(github_then_deploy)]
+        if args.domain:
+            futures.append(pool.submit(configure_domain))
+        for future in futures:
+            future.result()
 
     print("\n" + "=" * 50)
     print(f"{args.name} is ready!")
@@ -18,34 +18,76 @@ Prerequisites:
 import argparse
 import json
 import os
+import re
 import sys
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-
-# Load .env from project root if it exists
-env_file = Path(__file__).parent.parent / ".env"
-if env_file.exists():
-    for line in env_file.read_text().splitlines():
-        line = line.strip()
-        if line and not line.startswith("#") and "=" in line:
-            key, val = line.split("=", 1)
-            os.environ.setdefault(key.strip(), val.strip().strip('"').strip("'"))
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 PORKBUN_API = "https://api.porkbun.com/api/json/v3"
-API_KEY = os.environ.get("PORKBUN_API_KEY", "")
-SECRET = os.environ.get("PORKBUN_SECRET", "")
+
+# KEY=value lines; comments and malformed lines simply don't match
+_ENV_RE = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(.*)$", re.M)
+
+
+@lru_cache(maxsize=1)
+def load_env():
+    """Parse the project .env in one regex pass, on first use rather
+    than at import (callers may only need --check or --availability)."""
+    env_file = Path(__file__).parent.parent / ".env"
+    if not env_file.exists():
+        return {}
+    return {
+        key: val.strip().strip('"').strip("'")
+        for key, val in _ENV_RE.findall(env_file.read_text())
+    }
+
+
+@lru_cache(maxsize=None)
+def _credential(name):
+    """Resolve a credential: real environment wins over the .env file."""
+    return os.environ.get(name) or load_env().get(name, "")
 
 # Default Vercel CNAME target
 VERCEL_CNAME = "cname.vercel-dns.com"
 
+# Auth ping results are cached per key so back-to-back tool runs (the
+# scaffolder chains deploy + domain setup) skip the round trip
+AUTH_CACHE_TTL = 3600
+
+
+def _cache_dir():
+    """Per-user tool cache ($XDG_CACHE_HOME or ~/.cache)."""
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    path = Path(base) / "who-pays-them"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+# One session for the whole run: the urllib3 pool keeps the HTTPS
+# connection to api.porkbun.com alive, so only the first call pays the
+# TCP+TLS handshake. Pool size matches the parallel delete fan-out.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504]),
+))
+
 
 def porkbun_request(endpoint, extra_data=None):
     """Make an authenticated Porkbun API request."""
-    data = {"apikey": API_KEY, "secretapikey": SECRET}
+    data = {
+        "apikey": _credential("PORKBUN_API_KEY"),
+        "secretapikey": _credential("PORKBUN_SECRET"),
+    }
     if extra_data:
         data.update(extra_data)
 
-    resp = requests.post(f"{PORKBUN_API}{endpoint}", json=data, timeout=30)
+    resp = _SESSION.post(f"{PORKBUN_API}{endpoint}", json=data, timeout=30)
     result = resp.json()
 
     if result.get("status") != "SUCCESS":
@@ -56,16 +98,28 @@ def porkbun_request(endpoint, extra_data=None):
 
 def check_auth():
     """Verify Porkbun API credentials work."""
-    if not API_KEY or not SECRET:
+    api_key = _credential("PORKBUN_API_KEY")
+    if not api_key or not _credential("PORKBUN_SECRET"):
         print("ERROR: Porkbun API credentials not set.")
         print("  Set PORKBUN_API_KEY and PORKBUN_SECRET environment variables")
         print("  or add them to .env in project root.")
         print("  Get keys from: https://porkbun.com/account/api")
         return False
 
+    cache_path = _cache_dir() / "porkbun_auth.json"
+    if cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text())
+        except (json.JSONDecodeError, OSError):
+            cached = {}
+        if cached.get("key") == api_key[:8] and time.time() - cached.get("ts", 0) < AUTH_CACHE_TTL:
+            print("  Porkbun API: authenticated (cached)")
+            return True
+
     result = porkbun_request("/ping")
     if result:
         print(f"  Porkbun API: authenticated ({result.get('yourIp', 'ok')})")
+        cache_path.write_text(json.dumps({"key": api_key[:8], "ts": time.time()}))
         return True
     return False
 
@@ -99,31 +153,96 @@ def delete_dns_record(domain, record_id):
     return result is not None
 
 
-def setup_for_vercel(domain, target=None):
+def edit_dns_record_set(domain, record_type, subdomain, content, ttl=600):
+    """
+    Replace every record of (type, subdomain) in one call via Porkbun's
+    editByNameType endpoint - a single round trip where delete+create
+    would take two, with no window where the name resolves to nothing.
+    """
+    data = {"content": content, "ttl": str(ttl)}
+    # Root records omit the subdomain path segment entirely; a trailing
+    # slash is not the documented form
+    endpoint = f"/dns/editByNameType/{domain}/{record_type}"
+    if subdomain:
+        endpoint += f"/{subdomain}"
+    result = porkbun_request(endpoint, data)
+    if result:
+        label = f"{subdomain}.{domain}" if subdomain else domain
+        print(f"  Updated: {record_type} {label} -> {content}")
+        return True
+    return False
+
+
+def setup_for_vercel(domain, target=None, force=False):
     """Configure DNS records to point domain to Vercel."""
     target = target or VERCEL_CNAME
 
     print(f"\nSetting up {domain} -> {target}")
 
-    # Get existing records
+    # Diff current records against the desired state so idempotent
+    # re-runs cost one retrieve and zero writes
     records = get_dns_records(domain)
+    www = f"www.{domain}"
 
-    # Remove existing A/AAAA/CNAME records for root and www
-    for record in records:
-        name = record.get("name", "")
-        rtype = record.get("type", "")
-        if name in (domain, f"www.{domain}") and rtype in ("A", "AAAA", "CNAME"):
-            print(f"  Removing old {rtype} record: {name} -> {record.get('content')}")
-            delete_dns_record(domain, record["id"])
-
-    # Create CNAME for root domain (Porkbun supports ALIAS/CNAME flattening)
-    create_dns_record(domain, "ALIAS", "", target)
-
-    # Create CNAME for www subdomain
-    create_dns_record(domain, "CNAME", "www", target)
+    root_ok = www_ok = False
+    root_wrong = www_wrong = False  # Right type/name, wrong target: upsertable
+    stale = []
+    for r in records:
+        name = r.get("name", "")
+        rtype = r.get("type", "")
+        content = r.get("content", "")
+        if name == domain and rtype == "ALIAS" and not force:
+            if content == target:
+                root_ok = True
+            else:
+                root_wrong = True
+        elif name == www and rtype == "CNAME" and not force:
+            if content == target:
+                www_ok = True
+            else:
+                www_wrong = True
+        elif name in (domain, www) and rtype in ("A", "AAAA", "CNAME", "ALIAS"):
+            stale.append(r)
+
+    if root_ok and www_ok and not stale:
+        print(f"  DNS already configured: {domain} and www.{domain} -> {target}")
+        return True
 
+    # Remove only the wrong-type conflicts. Each delete is an independent
+    # ~100-300ms HTTPS round trip, so run them in parallel
+    def remove(record):
+        print(f"  Removing old {record['type']} record: {record['name']} -> {record.get('content')}")
+        delete_dns_record(domain, record["id"])
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=min(8, len(stale))) as pool:
+            list(pool.map(remove, stale))
+
+    # Fix what's left concurrently: editByNameType upserts a mistargeted
+    # record set in one round trip; create covers the missing ones.
+    # Root gets an ALIAS (Porkbun flattens it), www a plain CNAME.
+    def apply(rtype, subdomain, wrong):
+        if wrong:
+            return edit_dns_record_set(domain, rtype, subdomain, target)
+        return create_dns_record(domain, rtype, subdomain, target)
+
+    tasks = []
+    if not root_ok:
+        tasks.append(("ALIAS", "", root_wrong))
+    if not www_ok:
+        tasks.append(("CNAME", "www", www_wrong))
+    ok = True
+    if tasks:
+        with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+            futures = [pool.submit(apply, *task) for task in tasks]
+            ok = all(future.result() for future in futures)
+
+    if not ok:
+        print(f"\n  DNS setup INCOMPLETE for {domain}; see API errors above")
+        return False
     print(f"\n  DNS configured! {domain} and www.{domain} -> {target}")
     print(f"  Note: DNS propagation may take up to 24 hours (usually minutes).")
+    return True
 
 
 def show_dns(domain):
@@ -159,6 +278,8 @@ def main():
                         help=f"CNAME target (default: {VERCEL_CNAME})")
     parser.add_argument("--availability", action="store_true",
                         help="Check if domain is in your account")
+    parser.add_argument("--force", action="store_true",
+                        help="Tear down and recreate records even if they look right")
     args = parser.parse_args()
 
     print("=" * 50)
@@ -176,7 +297,8 @@ def main():
         show_dns(args.domain)
         return
 
-    setup_for_vercel(args.domain, args.target)
+    if not setup_for_vercel(args.domain, args.target, force=args.force):
+        sys.exit(1)
 
     print("\n" + "=" * 50)
     print("DNS setup complete!")